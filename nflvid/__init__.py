@@ -13,20 +13,36 @@ plays and construct a playlist to play in `vlc` with the
 [nflvid.vlc](http://pdoc.burntsushi.net/nflvid/vlc.m.html) submodule.
 """
 
+import array
+import bisect
 import gzip
+import itertools
 import json
 import math
+import mmap
 import multiprocessing.pool
 import os
 import os.path as path
+import re
 import signal
 import socket
+import struct
 import subprocess
 import sys
 import tempfile
 import threading
 import time
 import urllib2
+import urlparse
+try:
+    import xml.etree.cElementTree as etree
+except ImportError:
+    import xml.etree.ElementTree as etree
+
+try:
+    from cStringIO import StringIO
+except ImportError:
+    from StringIO import StringIO
 
 import httplib2
 
@@ -41,10 +57,41 @@ except NameError:  # I have lofty hopes for Python 3.
 
 __pdoc__ = {}
 
-__broadcast_cache = {}  # game eid -> play id -> Play
-__coach_cache = {}  # game eid -> play id -> Play
-
 _xmlf = path.join(path.split(__file__)[0], 'pbp-xml', '%s.xml.gz')
+_indexf = path.join(path.split(__file__)[0], 'pbp-index')
+_index = None  # mmap of _indexf, opened on first use.
+
+cache_dir = os.getenv('NFLVID_CACHE_DIR')
+if cache_dir is None:
+    _cache_home = os.getenv('XDG_CACHE_HOME')
+    if not _cache_home:
+        _cache_home = path.join(path.expanduser('~'), '.cache')
+    cache_dir = path.join(_cache_home, 'nflvid')
+cache_dir = cache_dir or None
+"""
+The directory used to cache data between runs, such as parsed play
+timings. It is `$NFLVID_CACHE_DIR` if that is set, and
+`$XDG_CACHE_HOME/nflvid` otherwise. Set it to `None` (or set
+`$NFLVID_CACHE_DIR` to an empty string) to disable caching on disk.
+"""
+
+xml_parser = 'etree'
+"""
+The parser used to read play timings from XML data. It is either
+`etree`, which streams rows with `xml.etree.cElementTree`, or `bs4`,
+which builds a full BeautifulSoup tree.
+"""
+_http_local = threading.local()
+_probe_pool = None  # Checks broadcast URLs. Created on first use.
+_probe_threads = 7  # One for each URL from broadcast_urls.
+_probe_lock = threading.Lock()
+_dead_url_ttl = 60 * 60 * 24
+_footage_indexes = {}  # footage_play_dir -> index, see _footage_games.
+_footage_dirty = set()  # footage_play_dirs with unsaved index changes.
+_footage_lock = threading.Lock()
+_toolchain = None  # See toolchain. Probed on first use.
+_toolchain_lock = threading.Lock()
+_rtmpdump_progress = re.compile(r'kB / ([0-9.]+) sec')
 _xml_base_urls = {
     'default': 'http://neulionms-a.akamaihd.net/fs/nfl/nfl/edl/' \
             'nflgr/%d/%s.xml',
@@ -78,12 +125,20 @@ def _eprint(s):
     print >> sys.stderr, s
 
 
+def _indent(s):
+    """
+    Indents every line of `s`, e.g., the output of a failed command.
+    """
+    return '\n'.join('   %s' % line for line in s.split('\n'))
+
+
 def broadcast_urls(gobj, quality='1600', condensed=False):
     """
     Returns possible HTTP Live Stream URLs (an m3u8 file) for the given
     game and quality. Use `nflvid.url_status` to determine
     if it's a valid URL or not. Alternatively, use
-    `nflvid.first_valid_broadcast_url` to retrieve the first valid URL.
+    `nflvid.first_valid_broadcast_url` to retrieve the first valid URL,
+    or `nflvid.broadcast_url` to do the same with caching.
 
     The kludge here is that the broadcast URLs can vary slightly and
     unpredictably from game to game. I haven't discovered a reliable
@@ -123,7 +178,7 @@ def url_status(url):
     `200`.
     """
     try:
-        resp, _ = httplib2.Http(timeout=10).request(url, 'HEAD')
+        resp, _ = _http().request(url, 'HEAD')
     except socket.timeout:
         return '404'
     return resp['status']
@@ -133,13 +188,81 @@ def first_valid_broadcast_url(urls):
     """
     Returns the first valid broadcast URL in the list. If there is no
     valid broadcast URL, then `None` is returned.
+
+    All of the URLs are checked at the same time, but a valid URL is
+    only returned once every URL before it in the list is known to be
+    invalid.
     """
-    for url in urls:
-        if url_status(url) == '200':
+    global _probe_pool
+
+    with _probe_lock:
+        if _probe_pool is None:
+            _probe_pool = multiprocessing.pool.ThreadPool(_probe_threads)
+    statuses = _probe_pool.imap(url_status, urls)
+    for url, status in itertools.izip(urls, statuses):
+        if status == '200':
             return url
     return None
 
 
+def broadcast_url(gobj, quality='1600', condensed=False):
+    """
+    Returns the first valid URL from `nflvid.broadcast_urls` for the
+    given game, quality and kind of footage, or `None` if none of them
+    are valid.
+
+    Results are remembered in `nflvid.cache_dir`, so the URLs of a game
+    are only checked once. Games without a valid URL are checked again
+    after a day, since footage is sometimes published late.
+    """
+    key = '%s-%s-%s' % (gobj.eid, quality,
+                        'condensed' if condensed else 'whole')
+    fp = path.join(cache_dir, 'broadcast-urls.json') if cache_dir else None
+    with _probe_lock:
+        cached = _read_broadcast_url_cache(fp).get(key)
+    if cached is not None:
+        if cached['url'] is not None \
+                or time.time() - cached['checked'] < _dead_url_ttl:
+            return cached['url']
+
+    url = first_valid_broadcast_url(
+        broadcast_urls(gobj, quality, condensed=condensed))
+    if fp is not None:
+        with _probe_lock:
+            urls = _read_broadcast_url_cache(fp)
+            urls[key] = {'url': url, 'checked': time.time()}
+            try:
+                _write_json(fp, {'version': 1, 'urls': urls})
+            except (IOError, OSError), e:
+                _eprint('Could not cache broadcast URLs in "%s": %s'
+                        % (fp, e))
+    return url
+
+
+def _read_broadcast_url_cache(fp):
+    if fp is None:
+        return {}
+    try:
+        with open(fp) as f:
+            cached = json.load(f)
+    except (IOError, ValueError):
+        return {}
+    if cached.get('version') != 1:
+        return {}
+    return cached['urls']
+
+
+def _http():
+    """
+    Returns an `httplib2.Http` object for the current thread. It is
+    kept for the life of the thread so that connections are reused.
+    """
+    h = getattr(_http_local, 'http', None)
+    if h is None:
+        h = _http_local.http = httplib2.Http(timeout=10)
+    return h
+
+
 def coach_url(gobj):
     """
     Returns the rtmp URL as a triple for the coach footage of the given
@@ -176,11 +299,12 @@ def footage_plays(footage_play_dir, eid):
 
     If no footage breakdown exists for the game provided, then an empty
     list is returned.
+
+    The listing is read from the footage index (see
+    `nflvid.footage_index`).
     """
-    fp = _play_path(footage_play_dir, eid)
-    if not os.access(fp, os.R_OK):
-        return []
-    return sorted(os.listdir(fp), key=lambda s: int(s[0:-4]))
+    return ['%04d.mp4' % pid
+            for pid in sorted(_game_index(footage_play_dir, eid))]
 
 
 def footage_play(footage_play_dir, eid, playid, stat=True):
@@ -188,17 +312,166 @@ def footage_play(footage_play_dir, eid, playid, stat=True):
     Returns a file path to an existing play slice in the footage play
     directory for the game and play given.
 
-    If the file for the play is not readable, then `None` is returned.
+    If the file for the play does not exist, then `None` is returned.
 
-    If `stat` is `False`, then the file's access will not be checked.
+    If `stat` is `False`, then the file's existence will not be
+    checked. Otherwise, it is checked with the footage index (see
+    `nflvid.footage_index`).
     """
     gamedir = _play_path(footage_play_dir, eid)
     fp = path.join(gamedir, '%04d.mp4' % int(playid))
-    if stat and not os.access(fp, os.R_OK):
+    if stat and int(playid) not in _game_index(footage_play_dir, eid):
         return None
     return fp
 
 
+def footage_index(footage_play_dir):
+    """
+    Returns a dictionary mapping every game eid in the footage play
+    directory to a dictionary of its sliced plays. The latter maps
+    integer play ids to `(size, mtime)` pairs of the play's file.
+
+    The index is saved in `{footage_play_dir}/.nflvid-index`. Only the
+    game directories whose modification time changed since the index
+    was last saved are scanned again, so keeping the index up to date
+    costs one `stat` per game instead of one per play.
+
+    The dictionaries returned should not be modified.
+    """
+    root = path.abspath(footage_play_dir)
+    with _footage_lock:
+        games = _footage_games(root)
+        try:
+            eids = [eid for eid in os.listdir(root)
+                    if len(eid) == 10 and eid.isdigit()]
+        except OSError:
+            eids = []
+        for eid in set(games).difference(eids):
+            del games[eid]
+            _footage_dirty.add(root)
+        for eid in eids:
+            _refresh_game(games, root, eid)
+        _write_footage_index(root)
+        return dict((eid, g[1]) for eid, g in games.iteritems())
+
+
+def _game_index(footage_play_dir, eid):
+    """
+    Returns the sliced plays of a single game from the footage index
+    of `footage_play_dir`. This is like `nflvid.footage_index` except
+    that only the game's directory is checked for changes, and the
+    index isn't saved. Callers that look up many games should save it
+    once at the end with `nflvid._save_footage_index`.
+    """
+    root = path.abspath(footage_play_dir)
+    with _footage_lock:
+        games = _footage_games(root)
+        _refresh_game(games, root, eid)
+        return games[eid][1] if eid in games else {}
+
+
+def _save_footage_index(footage_play_dir):
+    """
+    Saves the footage index of `footage_play_dir` if any game in it
+    changed since it was loaded or last saved.
+    """
+    with _footage_lock:
+        _write_footage_index(path.abspath(footage_play_dir))
+
+
+def _write_footage_index(root):
+    """
+    Like `nflvid._save_footage_index`, except `root` must be absolute
+    and `_footage_lock` must be held.
+    """
+    if root not in _footage_dirty:
+        return
+    try:
+        _write_json(path.join(root, '.nflvid-index'), {
+            'version': 2,
+            'games': dict((eid, [g[0], g[1].items()])
+                          for eid, g in _footage_indexes[root].iteritems()),
+        })
+    except (IOError, OSError):
+        pass  # Read only footage is fine, it just isn't faster.
+    _footage_dirty.discard(root)
+
+
+def _footage_games(root):
+    """
+    Returns the in memory footage index for the footage play directory
+    `root`, loading it from disk if necessary. Each game eid maps to a
+    list of the game directory's mtime when it was scanned and its
+    plays.
+
+    A game directory modified in the same second that the index was
+    saved may have changed again without its mtime changing (e.g., on
+    file systems that only keep whole seconds). Such games are loaded
+    without an mtime, so that they are scanned again. Both times come
+    from the file system, so the clock of this machine doesn't matter.
+
+    `_footage_lock` must be held.
+    """
+    if root not in _footage_indexes:
+        fp = path.join(root, '.nflvid-index')
+        saved = _read_json(fp)
+        games = {}
+        if saved is not None and saved.get('version') == 2:
+            try:
+                saved_at = os.stat(fp).st_mtime
+            except OSError:
+                saved_at = None
+            for eid, (mtime, ps) in saved['games'].iteritems():
+                if saved_at is None or mtime >= int(saved_at):
+                    mtime = None
+                games[str(eid)] = [mtime,
+                                   dict((pid, tuple(v)) for pid, v in ps)]
+        _footage_indexes[root] = games
+    return _footage_indexes[root]
+
+
+def _refresh_game(games, root, eid):
+    """
+    Scans the directory of game `eid` again if its mtime isn't the one
+    recorded in `games` when it was last scanned.
+
+    If the directory changes while it is being scanned, then no mtime
+    is recorded so that it is scanned again the next time it is
+    checked.
+    """
+    gamedir = _play_path(root, eid)
+    try:
+        mtime = os.stat(gamedir).st_mtime
+    except OSError:
+        if games.pop(eid, None) is not None:
+            _footage_dirty.add(root)
+        return
+    entry = games.get(eid)
+    if entry is not None and entry[0] == mtime:
+        return
+
+    ps = {}
+    try:
+        names = os.listdir(gamedir)
+    except OSError:
+        names = []
+    for name in names:
+        if not name.endswith('.mp4') or not name[0:-4].isdigit():
+            continue
+        try:
+            st = os.stat(path.join(gamedir, name))
+        except OSError:
+            continue
+        ps[int(name[0:-4])] = (st.st_size, st.st_mtime)
+    try:
+        if os.stat(gamedir).st_mtime != mtime:
+            mtime = None
+    except OSError:
+        mtime = None
+    games[eid] = [mtime, ps]
+    _footage_dirty.add(root)
+
+
 def _full_path(footage_dir, eid):
     return path.join(footage_dir, '%s.mp4' % eid)
 
@@ -217,8 +490,9 @@ def unsliced_plays(footage_play_dir, gobj, coach=True, dry_run=False):
     """
     Scans the game directory inside footage_play_dir and returns a list
     of plays that haven't been sliced yet. In particular, a play is
-    only considered sliced if the following file is readable, assuming
-    {playid} is its play id:
+    only considered sliced if the following file exists in the footage
+    index (see `nflvid.footage_index`), assuming {playid} is its play
+    id:
 
         {footage_play_dir}/{eid}/{playid}.mp4
 
@@ -236,22 +510,23 @@ def unsliced_plays(footage_play_dir, gobj, coach=True, dry_run=False):
     are sliced.
     """
     ps = plays(gobj, coach)
-    outdir = _play_path(footage_play_dir, gobj.eid)
 
     unsliced = []
     if ps is None:
         return None
+    sliced = _game_index(footage_play_dir, gobj.eid)
+    _save_footage_index(footage_play_dir)
     for i, p in enumerate(ps.values()):
         if dry_run and i >= 10:
             break
-        pid = p.idstr()
-        if not os.access(path.join(outdir, '%s.mp4' % pid), os.R_OK):
+        if int(p.playid) not in sliced:
             unsliced.append(p)
     return unsliced
 
 
 def slice(footage_play_dir, full_footage_file, gobj, coach=True,
-          num_parallel=4, dry_run=False):
+          num_parallel=4, dry_run=False, single_pass=False,
+          snap_keyframes=False):
     """
     Uses `ffmpeg` to slice the given footage file into play-by-play
     pieces.  The `full_footage_file` should be a path to a full
@@ -276,6 +551,237 @@ def slice(footage_play_dir, full_footage_file, gobj, coach=True,
 
     If `dry_run` is `True`, then only the first 10 plays of the game
     are sliced.
+
+    If `single_pass` is `True`, then plays that are next to each other
+    in the footage are grouped into runs with `nflvid.play_runs`, and
+    each run is sliced by a single `ffmpeg` process with
+    `nflvid.slice_plays`. Up to `num_parallel` runs are sliced at once.
+
+    If `snap_keyframes` is `True`, then the start and end of every play
+    are moved to the nearest key frame in the footage (see
+    `nflvid.footage_keyframes`), which makes cuts exact and seeks fast.
+    The amount that the cuts drifted from the play timings is reported.
+    """
+    tasks = _slice_tasks(footage_play_dir, full_footage_file, gobj, coach,
+                         dry_run, single_pass, snap_keyframes)
+    if tasks is None:
+        return
+    pool = multiprocessing.pool.ThreadPool(num_parallel)
+    drifts = {}
+    for ds in pool.map(lambda task: task[1](), tasks):
+        drifts.update(ds)
+    _report_drifts(gobj, drifts)
+    _eprint('DONE slicing game %s %s' % (gobj.eid, _nice_game(gobj)))
+
+
+def slice_many(footage_play_dir, games, coach=True, num_parallel=4,
+               dry_run=False, single_pass=False, snap_keyframes=False,
+               disk_parallel=None):
+    """
+    Slices many games at once, like calling `nflvid.slice` for each
+    one, except that the plays of every game are put in one work queue
+    that `num_parallel` threads take from. There is no waiting for the
+    slowest play of a game before the next game starts, and the
+    footage of several games is prepared (e.g., key frames found) at
+    the same time.
+
+    `games` should be a list of `(full_footage_file, gobj)` pairs.
+    Games are sliced in the order given; work from an earlier game is
+    always started before work from a later one. If `disk_parallel` is
+    not `None`, then at most that many `ffmpeg` processes read footage
+    from any one disk (device) at once, and threads move on to footage
+    on other disks instead.
+
+    If `num_parallel` is `auto`, then the number of `ffmpeg` processes
+    is tuned while slicing to get the most plays sliced per minute.
+    It starts at the number of CPUs and every change is reported,
+    along with the throughput, disk writes and CPU load that led to it.
+
+    Progress is reported as each game finishes. The other parameters
+    are the same as for `nflvid.slice`.
+    """
+    tuner = None
+    if num_parallel == 'auto':
+        tuner = _Autotuner()
+        num_parallel = tuner.high
+
+    def prepare(game):
+        fp, gobj = game
+        return _slice_tasks(footage_play_dir, fp, gobj, coach, dry_run,
+                            single_pass, snap_keyframes)
+
+    prep = multiprocessing.pool.ThreadPool(num_parallel)
+    try:
+        prepared = prep.map(prepare, games)
+    finally:
+        prep.close()
+
+    # Each entry is (game index, task index, device, plays, task).
+    queue = []
+    left, drifts = {}, {}
+    for gi, ((fp, gobj), tasks) in enumerate(zip(games, prepared)):
+        if not tasks:
+            continue
+        try:
+            dev = os.stat(fp).st_dev
+        except OSError:
+            dev = None
+        for ti, (ps, task) in enumerate(tasks):
+            queue.append((gi, ti, dev, ps, task))
+        left[gi], drifts[gi] = len(tasks), {}
+    total = sum(len(e[3]) for e in queue)
+    if total == 0:
+        return
+
+    cond = threading.Condition()
+    busy = {}  # device -> ffmpeg processes reading from it
+    state = {'sliced': 0, 'running': 0, 'start': time.time()}
+
+    def next_task():
+        with cond:
+            while queue:
+                if tuner is not None and state['running'] >= tuner.limit:
+                    cond.wait()
+                    continue
+                for i, e in enumerate(queue):
+                    if disk_parallel is None \
+                            or busy.get(e[2], 0) < disk_parallel:
+                        busy[e[2]] = busy.get(e[2], 0) + 1
+                        state['running'] += 1
+                        return queue.pop(i)
+                cond.wait()
+            return None
+
+    def work():
+        while True:
+            e = next_task()
+            if e is None:
+                return
+            gi, _, dev, ps, task = e
+            gobj = games[gi][1]
+            started, failed = time.time(), False
+            try:
+                ds = task()
+            except Exception, err:
+                # The game still has to be finished and reported, so one
+                # bad play doesn't take down the worker.
+                _eprint('Could not slice plays %s of game %s %s: %s'
+                        % (', '.join(p.idstr() for p in ps), gobj.eid,
+                           _nice_game(gobj), err))
+                ds, failed = {}, True
+            finally:
+                with cond:
+                    busy[dev] -= 1
+                    state['running'] -= 1
+                    cond.notify_all()
+            if tuner is not None and not failed:
+                outdir = _play_path(footage_play_dir, gobj.eid)
+                written = 0
+                for p in ps:
+                    try:
+                        written += os.stat(path.join(
+                            outdir, '%s.mp4' % p.idstr())).st_size
+                    except OSError:
+                        pass
+            with cond:
+                if tuner is not None and not failed:
+                    tuner.record(len(ps), time.time() - started, written)
+                    cond.notify_all()
+                drifts[gi].update(ds)
+                left[gi] -= 1
+                state['sliced'] += len(ps)
+                if left[gi] > 0:
+                    continue
+                elapsed = time.time() - state['start']
+                rate = state['sliced'] / max(elapsed, 0.001)
+                _report_drifts(gobj, drifts[gi])
+                _eprint('DONE slicing game %s %s (%d/%d plays, %.1f '
+                        'plays/s, about %d seconds left)'
+                        % (gobj.eid, _nice_game(gobj), state['sliced'],
+                           total, rate, (total - state['sliced']) / rate))
+
+    workers = [threading.Thread(target=work) for _ in xrange(num_parallel)]
+    for w in workers:
+        w.daemon = True
+        w.start()
+    for w in workers:
+        # Joining with a timeout lets Ctrl-C interrupt the main thread.
+        while w.is_alive():
+            w.join(1)
+
+
+class _Autotuner (object):
+    """
+    Picks how many `ffmpeg` processes `nflvid.slice_many` runs at once
+    by hill climbing: after every measurement window, the limit moves
+    one step in the same direction if plays per minute went up, and
+    turns around if it went down. The limit is held (not raised, and
+    not lowered either) while the `ffmpeg` processes are using nearly
+    all of the CPUs, since more of them would only compete for it.
+    """
+
+    def __init__(self, window=15):
+        try:
+            cpus = multiprocessing.cpu_count()
+        except NotImplementedError:
+            cpus = 2
+        self.cpus = cpus
+        self.low, self.high = 1, cpus * 4
+        self.limit = cpus
+        self.window = window
+        self._step = 1
+        self._last_rate = None
+        self._reset()
+
+    def record(self, plays, seconds, written):
+        """
+        Records a finished task that sliced `plays` plays, took
+        `seconds` seconds and wrote `written` bytes. The limit is
+        adjusted once the current window is over.
+        """
+        self._plays += plays
+        self._job_time += seconds
+        self._jobs += 1
+        self._written += written
+        elapsed = time.time() - self._started
+        if elapsed < self.window or self._jobs < self.limit:
+            return
+
+        t = os.times()
+        cpu = (t[2] + t[3] - self._cpu) / (elapsed * self.cpus)
+        rate = self._plays * 60 / elapsed
+        old = self.limit
+        if self._last_rate is not None and rate < self._last_rate:
+            self._step = -self._step
+        step = self._step
+        if step > 0 and cpu > 0.9:
+            step = 0  # Hold for a window, in case the CPUs free up.
+        self.limit = min(self.high, max(self.low, self.limit + step))
+        _eprint('Sliced %.1f plays/min with %d ffmpeg processes (%.1fs per '
+                'job, %.1f MB/s written, %d%% CPU). Now using %d.'
+                % (rate, old, self._job_time / self._jobs,
+                   self._written / elapsed / 1024 / 1024, cpu * 100,
+                   self.limit))
+        self._last_rate = rate
+        self._reset()
+
+    def _reset(self):
+        t = os.times()
+        self._started = time.time()
+        self._cpu = t[2] + t[3]  # CPU time used by ffmpeg processes.
+        self._plays = self._jobs = self._written = 0
+        self._job_time = 0.0
+
+
+def _slice_tasks(footage_play_dir, full_footage_file, gobj, coach=True,
+                 dry_run=False, single_pass=False, snap_keyframes=False):
+    """
+    Does everything `nflvid.slice` does before running `ffmpeg`, and
+    returns a list of `(plays, task)` pairs, where calling `task()`
+    slices the list of `nflvid.Play` objects `plays` and returns a
+    dictionary of how far each play's cuts drifted (see
+    `nflvid.slice_plays`). `None` is returned if there is nothing to
+    slice.
     """
     outdir = _play_path(footage_play_dir, gobj.eid)
     if not os.access(outdir, os.R_OK):
@@ -291,7 +797,7 @@ def slice(footage_play_dir, full_footage_file, gobj, coach=True,
                 'If they have not been sliced yet, then the XML play-by-play '
                 'meta data may not be available or is corrupt.'
                 % _nice_game(gobj))
-        return
+        return None
 
     # If this is broadcast footage, we need to find the offset of each play.
     # My current estimate is that the offset is the difference between the
@@ -310,19 +816,45 @@ def slice(footage_play_dir, full_footage_file, gobj, coach=True,
         if offset < 0:
             offset = 0
 
-    max_dur = 0 if coach else 25
-    pool = multiprocessing.pool.ThreadPool(num_parallel)
-
-    def doslice(p):
-        slice_play(footage_play_dir, full_footage_file, gobj, p,
-                   max_dur, coach, offset)
-    pool.map(doslice, unsliced)
+    keyframes = None
+    if snap_keyframes:
+        keyframes = footage_keyframes(full_footage_file)
+        if keyframes is None:
+            _eprint('Could not find key frames in "%s". Play boundaries '
+                    'will not be moved to key frames.' % full_footage_file)
 
-    _eprint('DONE slicing game %s %s' % (gobj.eid, _nice_game(gobj)))
+    max_dur = 0 if coach else 25
+    if single_pass:
+        def run_task(run):
+            return lambda: slice_plays(footage_play_dir, full_footage_file,
+                                       gobj, run, max_dur, coach, offset,
+                                       keyframes)
+        return [(run, run_task(run)) for run in play_runs(unsliced)]
+
+    def play_task(p):
+        def task():
+            drift = slice_play(footage_play_dir, full_footage_file, gobj, p,
+                               max_dur, coach, offset, keyframes)
+            return {} if drift is None else {p.playid: drift}
+        return task
+    return [([p], play_task(p)) for p in unsliced]
+
+
+def _report_drifts(gobj, drifts):
+    """
+    Reports how far the cuts of a game drifted from its play timings,
+    if they were moved to key frames.
+    """
+    if len(drifts) > 0:
+        ds = [abs(d) for drift in drifts.values() for d in drift]
+        _eprint('Cuts for game %s drifted from play timings by %.3fs on '
+                'average and %.3fs at most.'
+                % (gobj.eid, sum(ds) / len(ds), max(ds)))
 
 
 def slice_play(footage_play_dir, full_footage_file, gobj, play,
-               max_duration=0, cut_scoreboard=True, offset=0):
+               max_duration=0, cut_scoreboard=True, offset=0,
+               keyframes=None):
     """
     This is just like `nflvid.slice`, but it only slices the play
     provided.  In typical cases, `nflvid.slice` should be used since it
@@ -343,36 +875,251 @@ def slice_play(footage_play_dir, full_footage_file, gobj, play,
 
     When `offset` is greater than `0`, it is subtracted from the start
     time of `play` to get the actual start time used.
+
+    When `keyframes` is a sorted list of key frame times in seconds
+    (as returned by `nflvid.footage_keyframes`), the start and end of
+    the play are moved to the nearest key frames. The amount that each
+    moved is returned as a pair of seconds. Otherwise, `None` is
+    returned.
     """
     outdir = _play_path(footage_play_dir, gobj.eid)
-    st = play.start
     outpath = path.join(outdir, '%s.mp4' % play.idstr())
-
-    st = st.add_seconds(-offset)
-    et = play.end
-    if et is None:  # Probably the last play of the game.
-        et = st.add_seconds(40)
-    if max_duration > 0 and (et.seconds() - st.seconds()) > max_duration:
-        et = st.add_seconds(max_duration)
-
-    if cut_scoreboard:
-        st = st.add_seconds(3.0)
-
-    dr = PlayTime(seconds=et.fractional() - st.fractional())
-
-    start_time = '%02d:%02d:%02d.%d' % (st.hh, st.mm, st.ss, st.milli)
-    duration = '%02d:%02d:%02d.%d' % (dr.hh, dr.mm, dr.ss, dr.milli)
+    st, dr = _slice_window(play, max_duration, cut_scoreboard, offset)
+    drift = None
+    if keyframes:
+        start, end, drift = _snap_window(st.fractional(),
+                                         st.fractional() + dr.fractional(),
+                                         keyframes)
+        st, dr = PlayTime(seconds=start), PlayTime(seconds=end - start)
+
+    start_time = '%02d:%02d:%02d.%03d' % (st.hh, st.mm, st.ss, st.milli)
+    duration = '%02d:%02d:%02d.%03d' % (dr.hh, dr.mm, dr.ss, dr.milli)
     cmd = [
         'ffmpeg',
         '-ss', start_time,
         '-i', full_footage_file,
         '-acodec', 'copy',
         '-vcodec', 'copy',
-         '-absf', 'aac_adtstoasc',  # no idea. ffmpeg says I need it though.
+    ] + _ffmpeg_args('bsf') + [  # no idea. ffmpeg says I need it though.
         '-t', duration,
         outpath,
     ]
     _run_command(cmd)
+    return drift
+
+
+def slice_plays(footage_play_dir, full_footage_file, gobj, plays,
+                max_duration=0, cut_scoreboard=True, offset=0,
+                keyframes=None):
+    """
+    This is like `nflvid.slice_play`, except every play in the list
+    `plays` is sliced by a single `ffmpeg` process that reads
+    `full_footage_file` once, instead of one `ffmpeg` process (and one
+    seek) per play.
+
+    This uses `ffmpeg`'s segment muxer, which cuts the footage at the
+    first key frame at or after each play boundary. Plays whose footage
+    overlaps (which can happen with broadcast timings) are sliced in
+    additional passes over the footage. Each pass starts reading the
+    footage at its first play, so this works best for runs of plays
+    that are next to each other (see `nflvid.play_runs`).
+
+    This function will not check if the play-by-play directory for
+    `gobj` has been created.
+
+    If `keyframes` is given, then play boundaries are moved to the
+    nearest key frames as in `nflvid.slice_play`, and a dictionary
+    from play id to the amount each boundary moved is returned.
+    """
+    outdir = _play_path(footage_play_dir, gobj.eid)
+
+    # Times are in milliseconds so that boundaries compare exactly.
+    plays = list(plays)
+    table = TimingTable.from_plays(plays)
+    starts, durations = table.windows(max_duration, cut_scoreboard, offset)
+    windows, drifts = [], {}
+    for p, start, dur in zip(plays, starts, durations):
+        end = start + dur
+        if keyframes:
+            st, et, drifts[p.playid] = _snap_window(start / 1000.0,
+                                                    end / 1000.0, keyframes)
+            start, end = int(round(st * 1000)), int(round(et * 1000))
+        start = max(0, start)
+        if end > start:
+            windows.append((start, end, p))
+    windows.sort(key=lambda w: w[0:2])
+
+    # Each pass gets plays that don't overlap, since every segment the
+    # muxer writes belongs to at most one play.
+    passes = []
+    for w in windows:
+        for ws in passes:
+            if ws[-1][1] <= w[0]:
+                ws.append(w)
+                break
+        else:
+            passes.append([w])
+
+    for ws in passes:
+        # Seek to the first play in the pass, so that footage before it
+        # is never read. Every other time is relative to that play.
+        base = ws[0][0]
+        edges = sorted(set([w[0] for w in ws] + [w[1] for w in ws]))
+        segments = dict((edges.index(start), p) for start, _, p in ws)
+
+        tmpdir = tempfile.mkdtemp(prefix='.slice-', dir=outdir)
+        try:
+            cmd = [
+                'ffmpeg',
+                '-ss', '%.3f' % (base / 1000.0),
+                '-i', full_footage_file,
+                '-acodec', 'copy',
+                '-vcodec', 'copy',
+            ] + _ffmpeg_args('bsf') + [
+                '-t', '%.3f' % ((edges[-1] - base) / 1000.0),
+                '-f', 'segment',
+                '-segment_times', ','.join('%.3f' % ((e - base) / 1000.0)
+                                           for e in edges[1:]),
+                # Without some slack, a boundary that falls exactly on
+                # a key frame is cut at the key frame after it.
+                '-segment_time_delta', '0.010',
+                '-reset_timestamps', '1',
+                path.join(tmpdir, '%05d.mp4'),
+            ]
+            if not _run_command(cmd):
+                _eprint('FAILED to slice %d plays from game %s %s'
+                        % (len(ws), gobj.eid, _nice_game(gobj)))
+                continue
+            for i, p in segments.iteritems():
+                segf = path.join(tmpdir, '%05d.mp4' % i)
+                if os.access(segf, os.R_OK):
+                    os.rename(segf,
+                              path.join(outdir, '%s.mp4' % p.idstr()))
+        finally:
+            for f in os.listdir(tmpdir):
+                os.remove(path.join(tmpdir, f))
+            os.rmdir(tmpdir)
+    return drifts
+
+
+def play_runs(plays, gap=5):
+    """
+    Groups the `nflvid.Play` objects in `plays` into runs of plays whose
+    footage touches or overlaps, or that are at most `gap` seconds
+    apart. A list of runs is returned, where each run is a list of
+    plays sorted by start time, and the runs are sorted by start time.
+
+    Consecutive plays (e.g., a whole drive) end up in a single run,
+    which can be fetched or sliced with one connection or one `ffmpeg`
+    process instead of one for each play.
+    """
+    plays = list(plays)
+    starts, durations = TimingTable.from_plays(plays).windows(0, False)
+    windows = sorted(((start, start + max(0, dur), p)
+                      for start, dur, p in zip(starts, durations, plays)),
+                     key=lambda w: w[0:2])
+
+    runs, run_end = [], None
+    for start, end, p in windows:
+        if run_end is not None and start - run_end <= gap * 1000:
+            runs[-1].append(p)
+            run_end = max(run_end, end)
+        else:
+            runs.append([p])
+            run_end = end
+    return runs
+
+
+def _slice_window(play, max_duration=0, cut_scoreboard=True, offset=0):
+    """
+    Returns the start time and duration, as `nflvid.PlayTime` objects,
+    of the footage to slice for `play`. The parameters are the same as
+    for `nflvid.slice_play`.
+    """
+    table = TimingTable.from_plays([play])
+    starts, durations = table.windows(max_duration, cut_scoreboard, offset)
+    return _window_time(starts[0]), _window_time(durations[0])
+
+
+def _window_time(ms):
+    if ms < 0:
+        return PlayTime(seconds=ms / 1000.0)
+    return _playtime_from_ms(ms)
+
+
+def _snap_window(start, end, keyframes):
+    """
+    Moves the `start` and `end` times, in seconds, to the nearest key
+    frames in the sorted list `keyframes`. The new start and end times
+    are returned along with how far each boundary moved in seconds.
+    """
+    def nearest(t):
+        i = bisect.bisect_left(keyframes, t)
+        near = keyframes[max(0, i - 1):i + 1]
+        return min(near, key=lambda k: abs(k - t))
+    snapped_start, snapped_end = nearest(start), nearest(end)
+    if snapped_end <= snapped_start:
+        # Short plays could otherwise end up without any footage.
+        i = bisect.bisect_right(keyframes, snapped_start)
+        if i < len(keyframes):
+            snapped_end = keyframes[i]
+        else:
+            snapped_end = end
+    return (snapped_start, snapped_end,
+            (snapped_start - start, snapped_end - end))
+
+
+def footage_keyframes(full_footage_file):
+    """
+    Returns a sorted list of the times, in seconds, of every key frame
+    in the video stream of `full_footage_file`. If the key frames
+    could not be read with `ffprobe`, then `None` is returned.
+
+    Key frames are cached next to the footage file, e.g., in
+    `{footage_dir}/{eid}.keyframes`, so that `ffprobe` only needs to
+    scan the footage once. The cache is ignored if the footage file
+    changes.
+    """
+    cachef = path.splitext(full_footage_file)[0] + '.keyframes'
+    try:
+        st = os.stat(full_footage_file)
+    except OSError:
+        return None
+    stamp = [st.st_mtime, st.st_size]
+    try:
+        with open(cachef) as f:
+            cached = json.load(f)
+        if cached.get('source') == stamp:
+            return cached['keyframes']
+    except (IOError, ValueError, KeyError):
+        pass
+
+    # Reading packets is much faster than decoding frames, and the key
+    # frame flag is on each packet.
+    cmd = ['ffprobe', '-loglevel', 'error', '-select_streams', 'v:0',
+           '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0',
+           full_footage_file]
+    out = _run_command(cmd)
+    if not out or not isinstance(out, strtype):
+        return None
+    keyframes = []
+    for line in out.splitlines():
+        fields = line.strip().split(',')
+        if not any(f.startswith('K') for f in fields[1:]):
+            continue
+        try:
+            keyframes.append(float(fields[0]))
+        except ValueError:  # e.g., N/A
+            continue
+    keyframes.sort()
+    if len(keyframes) == 0:
+        return None
+
+    try:
+        _write_json(cachef, {'source': stamp, 'keyframes': keyframes})
+    except (IOError, OSError), e:
+        _eprint('Could not cache key frames in "%s": %s' % (cachef, e))
+    return keyframes
 
 
 def artificial_slice(footage_play_dir, gobj, gobj_play):
@@ -388,6 +1135,11 @@ def artificial_slice(footage_play_dir, gobj, gobj_play):
     Note that `gobj_play` is an `nflgame.game.Play` object and not a
     `nflvid.Play` object.
     """
+    if toolchain()['convert'] is None:
+        _eprint('Could not find ImageMagick\'s "convert", so play %s from '
+                'game %s %s was not artificially sliced.'
+                % (gobj_play.playid, gobj.eid, _nice_game(gobj)))
+        return
     outdir = _play_path(footage_play_dir, gobj.eid)
     outpath = path.join(outdir, '%04d.mp4' % int(gobj_play.playid))
 
@@ -414,33 +1166,265 @@ def artificial_slice(footage_play_dir, gobj, gobj_play):
         _run_command(cmd)
 
 
-def fetch_single_slice(footage_play_dir, gobj, play_id):
-    play = plays(gobj)[str(play_id)]
-    outdir = _play_path(footage_play_dir, gobj.eid)
-    outpath = os.path.join(outdir, '%s.mp4' % play.idstr())
+def fetch_single_slice(footage_play_dir, gobj, play_id, coach=True,
+                       quality='1600', condensed=False, jobs=4):
+    """
+    Downloads the footage of a single play, without downloading the
+    footage of the whole game, to the following path:
+
+        footage_play_dir/{eid}/{playid}.mp4
+
+    Coach footage is fetched with `rtmpdump`. If `coach` is `False`,
+    then broadcast footage with the given `quality` is fetched instead
+    by downloading only the HLS segments that cover the play (`jobs`
+    at a time) with `nflvid.hls.fetch_window`.
+
+    To fetch many plays, use `nflvid.fetch_slices`.
+    """
+    play = plays(gobj, coach)[str(play_id)]
+    outpath = footage_play(footage_play_dir, gobj.eid, play_id, stat=False)
     if os.access(outpath, os.R_OK):
         _eprint('Found play %d from game %s %s' % (
             play_id, gobj.eid, _nice_game(gobj)))
         return
+    _fetch_slice(footage_play_dir, gobj, play, coach, quality, condensed,
+                 jobs)
+
+
+def fetch_slices(footage_play_dir, gobj_plays, coach=True, quality='1600',
+                 condensed=False, jobs=4):
+    """
+    Fetches the footage of many plays like `nflvid.fetch_single_slice`,
+    with at most `jobs` downloads running at once. `gobj_plays` should
+    be a list of `(gobj, play_id)` pairs. Plays that are already on
+    disk are not fetched again.
+
+    The timings (and for broadcast footage, the playlist) of each game
+    are only looked up once, no matter how many of its plays are
+    fetched. Plays of the same game that are next to each other in the
+    footage (see `nflvid.play_runs`) are downloaded together as one
+    range, which is then sliced into plays locally.
+
+    An iterator is returned that yields a `(gobj, play_id, path)`
+    triple for each pair in `gobj_plays` as soon as that play is done.
+    `path` is `None` if the play could not be fetched. Plays are
+    yielded in the same order as `gobj_plays`, except that plays
+    downloaded together are yielded together, at the position of the
+    first of them. The plays are fetched in the background, so callers
+    may start using the first plays while the rest are downloading.
+    """
+    games, wanted = OrderedDict(), OrderedDict()
+    for gobj, play_id in gobj_plays:
+        games.setdefault(gobj.eid, gobj)
+        wanted.setdefault(gobj.eid, []).append(play_id)
+
+    # Map every play that needs fetching to the run of plays it is
+    # downloaded with.
+    segs, runs = {}, {}
+    for eid, gobj in games.items():
+        ps = plays(gobj, coach)
+        if ps is None:
+            continue
+        if not coach:
+            from nflvid import hls
+
+            url = broadcast_url(gobj, quality, condensed=condensed)
+            segs[eid] = (url and hls.segments(url)) or []
+        missing = [ps[str(pid)] for pid in set(wanted[eid])
+                   if str(pid) in ps]
+        missing = [p for p in missing
+                   if footage_play(footage_play_dir, eid, p.playid) is None]
+        for run in play_runs(missing):
+            for p in run:
+                runs[(eid, int(p.playid))] = run
+
+    tasks, seen = [], set()
+    for gobj, play_id in gobj_plays:
+        run = runs.get((gobj.eid, play_id))
+        if run is None:
+            tasks.append((gobj, None, [play_id]))
+        elif id(run) not in seen:
+            seen.add(id(run))
+            tasks.append((gobj, run, [int(p.playid) for p in run]))
+
+    def fetch(task):
+        gobj, run, play_ids = task
+        try:
+            if run is not None and len(run) == 1:
+                _fetch_slice(footage_play_dir, gobj, run[0], coach, quality,
+                             condensed, 1, segs.get(gobj.eid))
+            elif run is not None:
+                _fetch_run(footage_play_dir, gobj, run, coach, quality,
+                           condensed, segs.get(gobj.eid))
+        except Exception, e:
+            # One bad task shouldn't stop the rest of the batch, and its
+            # plays are simply missing below.
+            _eprint('FAILED to download plays %s from game %s %s: %s'
+                    % (', '.join(map(str, play_ids)), gobj.eid,
+                       _nice_game(gobj), e))
+        fetched = []
+        for play_id in play_ids:
+            fp = footage_play(footage_play_dir, gobj.eid, play_id)
+            if fp is None and run is None:
+                _eprint('Could not find timing for play %d from game %s %s'
+                        % (play_id, gobj.eid, _nice_game(gobj)))
+            fetched.append((gobj, play_id, fp))
+        return fetched
+
+    pool = multiprocessing.pool.ThreadPool(jobs)
+    fetched = pool.imap(fetch, tasks)
+    pool.close()
+    return (triple for triples in fetched for triple in triples)
+
+
+def _fetch_run(footage_play_dir, gobj, run, coach=True, quality='1600',
+               condensed=False, segs=None):
+    """
+    Fetches the footage of every play in `run`, a list of plays that
+    are next to each other, as one range. The range is then sliced into
+    plays with `nflvid.slice_plays`.
+    """
+    from nflvid import hls
+
+    outdir = _play_path(footage_play_dir, gobj.eid)
+    if not os.access(outdir, os.R_OK):
+        try:
+            os.makedirs(outdir)
+        except OSError:
+            if not path.isdir(outdir):
+                raise
+    _eprint('Downloading plays %s from game %s %s' % (
+        ', '.join(p.playid for p in run), gobj.eid, _nice_game(gobj)))
+
+    offset, max_dur = 0, 0
+    if not coach:
+        if segs is None:
+            url = broadcast_url(gobj, quality, condensed=condensed)
+            segs = url and hls.segments(url)
+        if not segs:
+            _eprint('FAILED to download plays from game %s %s'
+                    % (gobj.eid, _nice_game(gobj)))
+            return
+        if run[0].game_end is None:
+            _eprint('The end time of game %s %s is unknown, so its plays '
+                    'can\'t be found in its broadcast footage.'
+                    % (gobj.eid, _nice_game(gobj)))
+            return
+        actual = sum(seglen for _, seglen in segs)
+        offset = max(0, run[0].game_end.fractional() - actual + 2)
+        max_dur = 25
+    table = TimingTable.from_plays(run)
+    starts, durations = table.windows(max_dur, False, offset)
+    first = max(0, min(starts) // 1000)
+    end = max(st + dur for st, dur in zip(starts, durations))
+    last = int(math.ceil(end / 1000.0))
+
+    tmp = tempfile.NamedTemporaryFile(prefix='.run-', suffix='.mp4',
+                                      dir=outdir, delete=False)
+    tmp.close()
+    try:
+        if coach:
+            cmd = get_base_coach_rtmpdump_cmd(gobj)
+            cmd += ['--start', str(first), '--stop', str(last)]
+            cmd += ['-o', tmp.name]
+            ok = _run_command(cmd) is not False
+        else:
+            ok = hls.fetch_window(segs, first, last - first, tmp.name,
+                                  jobs=1)
+        if not ok:
+            _eprint('FAILED to download plays from game %s %s'
+                    % (gobj.eid, _nice_game(gobj)))
+            return
+
+        # Times in the downloaded range are relative to its start.
+        shifted = table.shifted(-first * 1000).plays().values()
+        slice_plays(footage_play_dir, tmp.name, gobj, shifted, max_dur,
+                    False, offset)
+    finally:
+        try:
+            os.remove(tmp.name)
+        except OSError:
+            pass
+
+
+def _fetch_slice(footage_play_dir, gobj, play, coach=True, quality='1600',
+                 condensed=False, jobs=4, segs=None):
+    """
+    Fetches the footage of `play` for `nflvid.fetch_single_slice` and
+    `nflvid.fetch_slices`. If `segs` is given, it is used as the HLS
+    segment list of the game's broadcast footage.
+
+    The footage is written to a temporary file first, so a play's
+    footage only appears in `footage_play_dir` once it is complete.
+    """
+    outdir = _play_path(footage_play_dir, gobj.eid)
+    outpath = path.join(outdir, '%s.mp4' % play.idstr())
+    play_id = int(play.playid)
     _eprint('Downloading play %d from game %s %s' % (
         play_id, gobj.eid, _nice_game(gobj)))
-    cmd = get_base_coach_rtmpdump_cmd(gobj)
-    cmd += ['--start', str(play.start.seconds())]
-    cmd += ['--stop', str(play.end.seconds())]
     if not os.access(outdir, os.R_OK):
-        os.makedirs(outdir)
-    cmd += ['-o', outpath]
-    try:
-        _run_command(cmd)
-    except:
+        try:
+            os.makedirs(outdir)
+        except OSError:
+            if not path.isdir(outdir):
+                raise
+    if not coach:
+        if not _fetch_broadcast_play(gobj, play, outpath, quality,
+                                     condensed, jobs, segs):
+            _eprint('FAILED to download play %d from game %s %s' % (
+                play_id, gobj.eid, _nice_game(gobj)))
+        return
+
+    # The last play of a game has no end, so its range comes from the
+    # same windows that slicing uses.
+    (start,), (duration,) = TimingTable.from_plays([play]).windows(0, False)
+    tmp = outpath + '.part'
+    cmd = get_base_coach_rtmpdump_cmd(gobj)
+    cmd += ['--start', str(max(0, start // 1000))]
+    cmd += ['--stop', str(int(math.ceil((start + duration) / 1000.0)))]
+    cmd += ['-o', tmp]
+    if _run_command(cmd) is False:
         _eprint('FAILED to download play %d from game %s %s' % (
             play_id, gobj.eid, _nice_game(gobj)))
-        os.remove(outpath)
-        raise
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return
+    os.rename(tmp, outpath)
+
+
+def _fetch_broadcast_play(gobj, play, outpath, quality='1600',
+                          condensed=False, jobs=4, segs=None):
+    """
+    Fetches the broadcast footage of `play` to `outpath` from the HLS
+    playlist of `gobj`. Returns `True` if and only if it was written.
+    """
+    from nflvid import hls
+
+    if segs is None:
+        url = broadcast_url(gobj, quality, condensed=condensed)
+        segs = url and hls.segments(url)
+    if not segs:
+        return False
+
+    # This uses the same offset as `nflvid.slice`, except the duration
+    # of the footage comes from the playlist instead of a file on disk.
+    # Without the reported end of the game, there is no offset.
+    if play.game_end is None:
+        _eprint('The end time of game %s %s is unknown, so play %s can\'t '
+                'be found in its broadcast footage.'
+                % (gobj.eid, _nice_game(gobj), play.playid))
+        return False
+    actual = sum(seglen for _, seglen in segs)
+    offset = max(0, play.game_end.fractional() - actual + 2)
+    st, dr = _slice_window(play, 25, False, offset)
+    return hls.fetch_window(segs, max(0, st.fractional()), dr.fractional(),
+                            outpath, jobs=jobs)
 
 
 def download_broadcast(footage_dir, gobj, quality='1600', dry_run=False,
-                       condensed=False):
+                       condensed=False, resumable=False, jobs=4):
     """
     Starts an `ffmpeg` process to download the full broadcast of the
     given game with the quality provided. The qualities available are:
@@ -462,34 +1446,32 @@ def download_broadcast(footage_dir, gobj, quality='1600', dry_run=False,
 
     If `condensed` is `True`, then a small recap of the game will be
     downloaded instead.
+
+    If `resumable` is `True`, then the footage is downloaded with
+    `nflvid.hls.download`, which fetches `jobs` pieces of the footage
+    at once and can resume a download that was interrupted. Otherwise,
+    a single `ffmpeg` process downloads the footage.
     """
     fp = _full_path(footage_dir, gobj.eid)
     if os.access(fp, os.R_OK):
         raise LookupError('Footage path "%s" already exists.' % fp)
 
-    urls = broadcast_urls(gobj, quality, condensed=condensed)
-    url = first_valid_broadcast_url(urls)
+    url = broadcast_url(gobj, quality, condensed=condensed)
     if url is None:
+        urls = broadcast_urls(gobj, quality, condensed=condensed)
         _eprint('BAD URLs for game %s: %s'
                 % (_nice_game(gobj), ', '.join(urls)))
         _eprint('FAILED to download game %s' % _nice_game(gobj))
         return
 
-    cmd = ['ffmpeg']
-    if not _is_avconv():
-        cmd += ['-timeout', '120']
-    cmd += ['-i', url]
-    if dry_run:
-        cmd += ['-t', '30']
-    cmd += [
-        '-absf', 'aac_adtstoasc',  # no idea. ffmpeg says I need it though.
-        '-acodec', 'copy',
-        '-vcodec', 'copy',
-        fp,
-    ]
-
     _eprint('Downloading game %s %s' % (gobj.eid, _nice_game(gobj)))
-    if not _run_command(cmd, monitor_file=fp):
+    if resumable:
+        from nflvid import hls
+        ok = hls.download(url, fp, jobs=jobs, dry_run=dry_run)
+    else:
+        cmd = _broadcast_download_cmd(url, fp, dry_run)
+        ok = _run_command(cmd, monitor_file=fp)
+    if not ok:
         _eprint('FAILED to download game %s' % _nice_game(gobj))
     else:
         _eprint('DONE with game %s %s' % (gobj.eid, _nice_game(gobj)))
@@ -525,11 +1507,7 @@ def download_coach(footage_dir, gobj, dry_run=False):
     if os.access(fp, os.R_OK):
         raise LookupError('Footage path "%s" already exists.' % fp)
 
-    cmd = get_base_coach_rtmpdump_cmd(gobj)
-    if dry_run:
-        cmd += ['--stop', '30']
-    cmd += ['-o', fp]
-
+    cmd = _coach_download_cmd(gobj, fp, dry_run)
     _eprint('Downloading game %s %s' % (gobj.eid, _nice_game(gobj)))
     status = _run_command(cmd)
     if status is None:
@@ -562,17 +1540,376 @@ def download_coach(footage_dir, gobj, dry_run=False):
                 pass
 
 
-def _file_monitor(pid, f, stop, timeout=90):
-    '''
-    Given a path to a file `f` and a `pid` of a process writing to that
-    file, this will repeatedly check whether a file is increasing in
-    size. If it doesn't increase in size after `timeout` seconds, then
-    `SIGKILL` is sent to `pid`.
-
-    `stop` must be a `threading.Event`. When it is set, this monitor
-    will quit.
-    '''
-    last_size = None
+def _broadcast_download_cmd(url, fp, dry_run=False):
+    """
+    Returns the `ffmpeg` command that downloads the broadcast footage
+    at the HLS `url` to the file `fp`.
+    """
+    cmd = ['ffmpeg'] + _ffmpeg_args('timeout') + ['-i', url]
+    if dry_run:
+        cmd += ['-t', '30']
+    cmd += _ffmpeg_args('bsf')  # no idea. ffmpeg says I need it though.
+    cmd += [
+        '-acodec', 'copy',
+        '-vcodec', 'copy',
+        fp,
+    ]
+    return cmd
+
+
+def _coach_download_cmd(gobj, fp, dry_run=False):
+    """
+    Returns the `rtmpdump` command that downloads the coach footage of
+    `gobj` to the file `fp`.
+    """
+    cmd = get_base_coach_rtmpdump_cmd(gobj)
+    if dry_run:
+        cmd += ['--stop', '30']
+    cmd += ['-o', fp]
+    return cmd
+
+
+def download_games(footage_dir, games, coach=True, quality='1600',
+                   dry_run=False, condensed=False, jobs=2, host_jobs=None,
+                   retries=2, retry_delay=30, stall_timeout=90,
+                   progress=None):
+    """
+    Downloads the footage of every game in the list `games`, with at
+    most `jobs` downloads running at once and at most `host_jobs`
+    downloads running against any one server. (If `host_jobs` is
+    `None`, then only `jobs` applies.) The parameters `coach`,
+    `quality`, `dry_run` and `condensed` are the same as for
+    `nflvid.download_coach` and `nflvid.download_broadcast`.
+
+    Unlike calling those functions from a thread pool, this manages
+    every `rtmpdump` or `ffmpeg` process from a single thread, so a
+    whole season can be queued at once. A download whose file has not
+    grown in `stall_timeout` seconds is killed. Failed downloads are
+    retried up to `retries` times, waiting `retry_delay` seconds before
+    the first retry and twice as long before each one after that.
+    Incomplete coach downloads are resumed rather than restarted.
+
+    If footage for any of the games already exists, then an
+    `exceptions.LookupError` is raised before anything is downloaded.
+
+    If `progress` is not `None`, then it is called as `progress(gobj,
+    seconds, done)` whenever `rtmpdump` reports that more of a game's
+    footage has been written, where `seconds` is how much of the game
+    is on disk. It is called one last time with `done` set to `True`
+    when the download finishes completely. (`ffmpeg` does not report
+    progress, so this only applies to coach footage.)
+
+    A dictionary is returned mapping each game's eid to `True` if its
+    download finished, `None` if it finished incomplete and `False` if
+    it failed.
+    """
+    pending = []
+    for gobj in games:
+        fp = _full_path(footage_dir, gobj.eid)
+        if os.access(fp, os.R_OK):
+            raise LookupError('Footage path "%s" already exists.' % fp)
+        pending.append(_Download(gobj, fp))
+
+    # Broadcast URLs are checked with HTTP requests, so find them all
+    # before any download starts. Otherwise, running downloads wouldn't
+    # be watched while the URLs of waiting games are checked.
+    for dl in pending:
+        if coach:
+            dl.cmd = _coach_download_cmd(dl.gobj, dl.fp, dry_run)
+            dl.host = urlparse.urlsplit(_coach_url[0]).hostname
+    if not coach and pending:
+        def find_url(dl):
+            return broadcast_url(dl.gobj, quality, condensed=condensed)
+        pool = multiprocessing.pool.ThreadPool(min(jobs, len(pending)))
+        try:
+            urls = pool.map(find_url, pending)
+        finally:
+            pool.close()
+        for dl, url in zip(pending, urls):
+            if url is None:
+                urls = broadcast_urls(dl.gobj, quality, condensed=condensed)
+                _eprint('BAD URLs for game %s: %s'
+                        % (_nice_game(dl.gobj), ', '.join(urls)))
+                continue
+            dl.cmd = _broadcast_download_cmd(url, dl.fp, dry_run)
+            dl.host = urlparse.urlsplit(url).hostname
+
+    results, running = {}, []
+    while pending or running:
+        now = time.time()
+        for dl in pending[:]:
+            if len(running) >= jobs:
+                break
+            if dl.not_before > now:
+                continue
+            host = dl.host
+            if host is None:
+                pending.remove(dl)
+                results[dl.gobj.eid] = False
+                _eprint('FAILED to download game %s' % _nice_game(dl.gobj))
+                continue
+            if host_jobs is not None \
+                    and sum(1 for r in running if r.host == host) >= host_jobs:
+                continue
+            pending.remove(dl)
+            if dl.start():
+                running.append(dl)
+            else:
+                results[dl.gobj.eid] = False
+
+        time.sleep(1)
+        for dl in running[:]:
+            status = dl.poll(stall_timeout)
+            if progress is not None and dl.seconds != dl.last_seconds:
+                dl.last_seconds = dl.seconds
+                progress(dl.gobj, dl.seconds, False)
+            if status == 'running':
+                continue
+            running.remove(dl)
+            if status == 'done':
+                if progress is not None:
+                    progress(dl.gobj, dl.seconds, True)
+                results[dl.gobj.eid] = True
+                _eprint('DONE with game %s %s'
+                        % (dl.gobj.eid, _nice_game(dl.gobj)))
+            elif status == 'empty':
+                # There is nothing to retry if the footage isn't there.
+                results[dl.gobj.eid] = False
+                _eprint('FAILED to download game %s %s'
+                        % (dl.gobj.eid, _nice_game(dl.gobj)))
+                _eprint('No data retrieved. Maybe coach footage does not '
+                        'exist yet?')
+                dl.remove_file()
+            elif dl.attempts <= retries:
+                delay = retry_delay * 2 ** (dl.attempts - 1)
+                _eprint('Retrying game %s %s in %d seconds (attempt %d/%d).'
+                        % (dl.gobj.eid, _nice_game(dl.gobj), delay,
+                           dl.attempts + 1, retries + 1))
+                if status == 'incomplete':
+                    if '--resume' not in dl.cmd:
+                        dl.cmd = dl.cmd + ['--resume']
+                else:
+                    dl.remove_file()
+                dl.not_before = time.time() + delay
+                pending.append(dl)
+            elif status == 'incomplete':
+                results[dl.gobj.eid] = None
+                _eprint('DONE (incomplete) with game %s %s'
+                        % (dl.gobj.eid, _nice_game(dl.gobj)))
+            else:
+                results[dl.gobj.eid] = False
+                _eprint('FAILED to download game %s %s'
+                        % (dl.gobj.eid, _nice_game(dl.gobj)))
+                dl.remove_file()
+    return results
+
+
+def download_and_slice(footage_dir, footage_play_dir, games, dry_run=False,
+                       jobs=2, host_jobs=None, slice_jobs=4, retries=2,
+                       retry_delay=30, stall_timeout=90, lag=10):
+    """
+    Downloads the coach footage of every game in `games` like
+    `nflvid.download_games`, and slices it into `footage_play_dir` like
+    `nflvid.slice` while it downloads. A play is sliced as soon as
+    `rtmpdump` reports that the footage on disk goes `lag` seconds
+    past the end of the play, with up to `slice_jobs` plays sliced at
+    once. The rest of the plays, like the last play of the game, are
+    sliced when the download finishes.
+
+    Plays that are already sliced are skipped, but the full footage
+    must not exist yet (see `nflvid.download_games`). The other
+    parameters and the return value are the same as for
+    `nflvid.download_games`. If a download doesn't finish, then only
+    the plays it covers are sliced.
+    """
+    todo = {}  # eid -> plays that haven't been queued for slicing yet
+    for gobj in games:
+        outdir = _play_path(footage_play_dir, gobj.eid)
+        if not os.access(outdir, os.R_OK):
+            os.makedirs(outdir)
+        todo[gobj.eid] = unsliced_plays(footage_play_dir, gobj) or []
+
+    pool = multiprocessing.pool.ThreadPool(slice_jobs)
+    queued = []  # (gobj, play, async result) of every play being sliced
+
+    def progress(gobj, seconds, done):
+        ready = []
+        for p in todo[gobj.eid]:
+            if done and not dry_run:
+                ready.append(p)
+                continue
+            if p.end is None or seconds is None:
+                continue
+            start, duration = _slice_window(p)
+            if start.fractional() + duration.fractional() + lag <= seconds:
+                ready.append(p)
+        if not ready:
+            return
+        todo[gobj.eid] = [p for p in todo[gobj.eid] if p not in ready]
+        fp = _full_path(footage_dir, gobj.eid)
+        for p in ready:
+            result = pool.apply_async(slice_play,
+                                      (footage_play_dir, fp, gobj, p))
+            queued.append((gobj, p, result))
+        if done or not todo[gobj.eid]:
+            _eprint('Queued the last plays of game %s %s for slicing'
+                    % (gobj.eid, _nice_game(gobj)))
+
+    try:
+        results = download_games(footage_dir, games, True, dry_run=dry_run,
+                                 jobs=jobs, host_jobs=host_jobs,
+                                 retries=retries, retry_delay=retry_delay,
+                                 stall_timeout=stall_timeout,
+                                 progress=progress)
+    finally:
+        pool.close()
+        pool.join()
+
+    failed = {}  # eid -> number of plays that could not be sliced
+    for gobj, p, result in queued:
+        try:
+            result.get()
+        except Exception, e:
+            _eprint('Could not slice play %s of game %s %s: %s'
+                    % (p.playid, gobj.eid, _nice_game(gobj), e))
+            failed[gobj.eid] = failed.get(gobj.eid, 0) + 1
+    for gobj in games:
+        if todo[gobj.eid] and not dry_run:
+            _eprint('%d plays of game %s %s were not sliced because its '
+                    'footage is incomplete.'
+                    % (len(todo[gobj.eid]), gobj.eid, _nice_game(gobj)))
+        elif failed.get(gobj.eid):
+            _eprint('%d plays of game %s %s could not be sliced.'
+                    % (failed[gobj.eid], gobj.eid, _nice_game(gobj)))
+        else:
+            _eprint('DONE slicing game %s %s' % (gobj.eid, _nice_game(gobj)))
+    return results
+
+
+class _Download (object):
+    """
+    The state of a single download run by `nflvid.download_games`.
+    """
+    def __init__(self, gobj, fp):
+        self.gobj = gobj
+        self.fp = fp
+        self.cmd = None
+        self.host = None
+        self.attempts = 0
+        self.not_before = 0
+        self.proc = None
+        self.output = None
+        self.last_size = None
+        self.last_progress = None
+        self.seconds = None  # Footage on disk, as reported by rtmpdump.
+        self.last_seconds = None
+
+    def start(self):
+        """
+        Starts the download process and returns `True` if it started.
+        """
+        self.attempts += 1
+        # Output goes to a file so that a chatty process can never block
+        # on a full pipe that nobody is reading. It has a name so that
+        # progress can be read without moving the process's file offset.
+        self.output = tempfile.NamedTemporaryFile()
+        devnull = open(os.devnull)
+        try:
+            self.proc = subprocess.Popen(self.cmd,
+                                         stdin=devnull,
+                                         stdout=self.output,
+                                         stderr=subprocess.STDOUT)
+        except OSError, e:
+            _eprint("Could not run '%s' (errno: %d): %s"
+                    % (' '.join(self.cmd), e.errno, e.strerror))
+            self.output.close()
+            return False
+        finally:
+            devnull.close()
+        self.last_size, self.last_progress = None, time.time()
+        _eprint('Downloading game %s %s'
+                % (self.gobj.eid, _nice_game(self.gobj)))
+        return True
+
+    def poll(self, stall_timeout):
+        """
+        Checks on the download process and returns one of `running`,
+        `done`, `incomplete`, `empty` or `failed`. A process that has
+        not written anything in `stall_timeout` seconds is killed.
+        """
+        code = self.proc.poll()
+        self._read_progress()
+        if code is None:
+            size = self._size()
+            if size != self.last_size:
+                self.last_size, self.last_progress = size, time.time()
+            elif time.time() - self.last_progress > stall_timeout:
+                _eprint('Download for "%s" has not made progress in %d '
+                        'seconds.\nKilling the download process %d.'
+                        % (self.fp, stall_timeout, self.proc.pid))
+                os.kill(self.proc.pid, signal.SIGKILL)
+                self.proc.wait()
+                self._finish()
+                return 'failed'
+            return 'running'
+
+        output = self._finish()
+        if code == 0:
+            return 'done' if self._size() > 0 else 'empty'
+        # A hack for rtmpdump...
+        if code == 2 and self.cmd[0] == 'rtmpdump':
+            return 'incomplete'
+        _eprint("Could not run '%s' (exit code %d):\n%s"
+                % (' '.join(self.cmd), code, _indent(output)))
+        return 'failed'
+
+    def remove_file(self):
+        try:
+            os.remove(self.fp)
+        except OSError:
+            pass
+
+    def _read_progress(self):
+        """
+        Sets `seconds` to the last progress reported by `rtmpdump`,
+        e.g., `1234.567 kB / 120.45 sec (3.2%)`.
+        """
+        if self.cmd[0] != 'rtmpdump':
+            return
+        try:
+            with open(self.output.name, 'rb') as f:
+                f.seek(max(0, os.fstat(f.fileno()).st_size - 512))
+                found = _rtmpdump_progress.findall(f.read())
+        except IOError:
+            return
+        if found:
+            self.seconds = float(found[-1])
+
+    def _finish(self):
+        self.output.seek(0)
+        output = self.output.read().strip()
+        self.output.close()
+        self.proc = None
+        return output
+
+    def _size(self):
+        try:
+            return os.stat(self.fp).st_size
+        except OSError:
+            return 0
+
+
+def _file_monitor(pid, f, stop, timeout=90):
+    '''
+    Given a path to a file `f` and a `pid` of a process writing to that
+    file, this will repeatedly check whether a file is increasing in
+    size. If it doesn't increase in size after `timeout` seconds, then
+    `SIGKILL` is sent to `pid`.
+
+    `stop` must be a `threading.Event`. When it is set, this monitor
+    will quit.
+    '''
+    last_size = None
     while True:
         if stop.is_set():
             break
@@ -615,9 +1952,8 @@ def _run_command(cmd, monitor_file=None):
         # A hack for rtmpdump...
         if e.returncode == 2 and cmd[0] == 'rtmpdump':
             return None
-        indent = lambda s: '\n'.join(map(lambda l: '   %s' % l, s.split('\n')))
         _eprint("Could not run '%s' (exit code %d):\n%s"
-                % (' '.join(cmd), e.returncode, indent(e.output)))
+                % (' '.join(cmd), e.returncode, _indent(e.output)))
         return False
     except OSError, e:
         _eprint("Could not run '%s' (errno: %d): %s"
@@ -641,34 +1977,370 @@ def plays(gobj, coach=True):
     If there is a problem retrieving the data, `None` is returned.
 
     If the game is over, then the XML data is saved to disk.
-    """
-    if coach:
-        cache = __coach_cache
-    else:
-        cache = __broadcast_cache
-
-    if gobj.game_over() and gobj.eid in cache:
-        return cache[gobj.eid]
 
-    rawxml = _get_xml_data(gobj.eid, gobj.gamekey)
-    ps = _xml_plays(rawxml, coach)
+    Timings for games that are over are kept in `nflvid.timing_cache`.
+    To follow the timings of a game in progress, use `nflvid.LiveGame`.
+    """
+    ps = None
+    if gobj.game_over():
+        ps = timing_cache.get(gobj.eid, coach)
+    if ps is None:
+        ps = _timings(gobj)[coach]
     if ps is None:
         return None
     if len(ps) == 0:
         _eprint('Could not find timing nodes in XML data, '
                 'which provide the start time of each play.')
         return None
-    __broadcast_cache[gobj.eid] = ps
+    return ps
+
+
+def timings(gobj):
+    """
+    Returns a pair of ordered dictionaries of all plays for a
+    particular game. The first has timings for the coach footage and
+    the second has timings for the broadcast footage. Either one is
+    `None` if those timings aren't available.
+
+    This is like calling `nflvid.plays` twice, except the play-by-play
+    meta data is only retrieved and parsed once.
+
+    The game `gobj` must be an `nflgame.game.Game` object.
+    """
+    ts = {True: None, False: None}
+    if gobj.game_over():
+        ts = dict((coach, timing_cache.get(gobj.eid, coach))
+                  for coach in (True, False))
+    if None in ts.values():
+        ts = _timings(gobj)
+    return ts[True] or None, ts[False] or None
+
+
+class LiveGame (object):
+    """
+    Follows the play timings of a game that is in progress by fetching
+    its XML play data over and over again. Unlike `nflvid.plays`, which
+    downloads and parses the whole document every time it is called
+    for a game that isn't over, requests are conditional (so nothing is
+    downloaded if nothing changed) and only the rows added since the
+    last poll are parsed.
+
+    A play's end is the start of the play after it, so plays are
+    reported once the next play has started. Use
+    `nflvid.LiveGame.follow` to get plays as they happen, e.g., to
+    slice them.
+    """
+
+    def __init__(self, gobj, coach=True, base_url=None):
+        """
+        Tracks the game `gobj`, which must be an `nflgame.game.Game`
+        object, with coach timings. If `coach` is `False`, then
+        broadcast timings are used.
+
+        `base_url` overrides the URL format of the XML data (see
+        `nflvid.sync_xml`).
+        """
+        self.gobj = gobj
+        """The `nflgame.game.Game` object being tracked."""
+
+        self.coach = coach
+        """Whether coach or broadcast timings are tracked."""
+
+        self.plays = OrderedDict()
+        """
+        An ordered dictionary of all plays timed so far, like the one
+        returned by `nflvid.plays`. The end of the last play is `None`
+        until the next play starts.
+        """
+
+        self.base_url = base_url
+        self._headers = {}  # Validators for conditional requests.
+        self._data = ''
+        self._offset = None  # Where the rows that haven't been read start.
+        self._first = 0  # Where the first row starts.
+        self._last = None  # (playid, start, ignore) of the last timed row.
+        self._reported = set()
+        self._game_end = None
+
+    def poll(self):
+        """
+        Fetches the XML data of the game once and returns a list of
+        the `nflvid.Play` objects whose end is now known, in the order
+        that they happened. The list is empty if nothing changed or the
+        data could not be fetched.
+
+        If rows that were already read change (which is rare), then all
+        rows are read again. Plays that were already returned are not
+        returned again, even if their timings changed, but
+        `nflvid.LiveGame.plays` is always up to date.
+        """
+        u = _xml_url(self.gobj.eid, self.gobj.gamekey, self.base_url)
+        try:
+            resp, data = _http().request(u, headers=self._headers)
+        except (socket.error, httplib2.HttpLib2Error), e:
+            _eprint('%s (%s)' % (e, u))
+            return []
+        if resp.status == 304:
+            return []
+        if resp.status != 200:
+            _eprint('HTTP %d (%s)' % (resp.status, u))
+            return []
+        self._headers = {}
+        if resp.get('etag'):
+            self._headers['if-none-match'] = resp['etag']
+        if resp.get('last-modified'):
+            self._headers['if-modified-since'] = resp['last-modified']
+
+        # Only the rows are compared with the last data read, since the
+        # attributes of the tags before them (e.g., endTime) change on
+        # almost every update.
+        first = data.find('<row')
+        read = data[first:first + self._offset - self._first] \
+            if self._offset is not None else None
+        if first < 0 or read != self._data[self._first:self._offset]:
+            self.plays, self._last, self._offset = OrderedDict(), None, None
+            start = first
+        else:
+            start = first + len(read)
+        self._data, self._first = data, first
+        self._update_game_end()
+        end = data.rfind('</row>')
+        if start < 0 or end < start:
+            return []
+        end += len('</row>')
+        self._offset = end
+
+        seg = '<dataset>%s</dataset>' % data[start:end]
+        try:
+            _, rows = _xml_rows_etree(seg)
+        except etree.ParseError:
+            _, rows = _xml_rows_bs4(seg)
+        done = []
+        col = 1 if self.coach else 2
+        for playid, coach, broadcast, ignore in rows:
+            t = (coach, broadcast)[col - 1]
+            if not t:
+                continue
+            try:
+                t = PlayTime(t)
+            except (AssertionError, IndexError), e:
+                _eprint('Could not read timing of play %s: %s' % (playid, e))
+                continue
+            if self._last is not None and not self._last[2]:
+                p = self.plays[self._last[0]]
+                p.end = t
+                if p.playid not in self._reported:
+                    self._reported.add(p.playid)
+                    done.append(p)
+            self._last = (playid, t, ignore)
+            if not ignore:
+                self.plays[playid] = Play(t, None, playid, self._game_end)
+        return done
+
+    def follow(self, interval=15, done=None):
+        """
+        Returns an iterator of `nflvid.Play` objects, one for each
+        play in the game, as soon as it has been timed. The XML data
+        is polled every `interval` seconds until `done()` returns
+        `True`, which defaults to the game's `game_over` method. The
+        last play is returned when the game is done.
+
+        The XML data is saved to disk once the game is over.
+        """
+        done = done or self.gobj.game_over
+        while True:
+            finished = done()
+            for p in self.poll():
+                yield p
+            if finished:
+                break
+            time.sleep(interval)
+        if self._last is not None and not self._last[2]:
+            p = self.plays[self._last[0]]
+            if p.playid not in self._reported:
+                self._reported.add(p.playid)
+                yield p
+
+        fp = _xmlf % self.gobj.eid
+        if self._data and self.gobj.game_over() \
+                and not os.access(fp, os.R_OK):
+            try:
+                _write_gzip(fp, self._data)
+            except (IOError, OSError):
+                _eprint('Could not cache XML data. Please make '
+                        '"%s" writable.' % path.dirname(fp))
+
+    def _update_game_end(self):
+        """
+        Reads the game end time from the `dataset` tag and sets it on
+        every play, since it may change while the game is played.
+        """
+        start = self._data.find('<dataset')
+        end = self._data.find('>', start)
+        if start < 0 or end < 0:
+            return
+        try:
+            tag = etree.fromstring(self._data[start:end] + '/>')
+            game_end = _lower_attrs(tag.attrib).get('endtime', '').strip()
+            game_end = PlayTime(game_end) if game_end else None
+        except (etree.ParseError, AssertionError, IndexError):
+            return
+        if _playtime_ms(game_end) != _playtime_ms(self._game_end):
+            self._game_end = game_end
+            for p in self.plays.itervalues():
+                p.game_end = game_end
+
+
+def _timings(gobj):
+    """
+    Retrieves the coach and broadcast timings for the game given and
+    returns them as a dictionary keyed by `coach`. If the game is over,
+    then both timings are also stored in `nflvid.timing_cache`. (The
+    timings of a game in progress are incomplete, so they must not be
+    returned from the cache once the game is over.)
+
+    If the game is over, then the XML data is saved to disk.
+    """
+    # Finished games are usually in the timing index, which is much
+    # faster than parsing XML. Failing that, timings parsed by a previous
+    # run may be in the on disk cache.
+    rawxml, stamp = None, None
+    ts = dict((coach, _indexed_plays(gobj.eid, coach))
+              for coach in (True, False))
+    if None in ts.values():
+        ts = _read_disk_timings(gobj.eid)
+    if ts is None:
+        stamp = _xml_stamp(gobj.eid)
+        rawxml = _get_xml_data(gobj.eid, gobj.gamekey)
+        ts = _xml_timings(rawxml)
+        if ts is None:
+            return {True: None, False: None}
+    if gobj.game_over():
+        for coach, ps in ts.items():
+            if ps is not None:
+                timing_cache.put(gobj.eid, coach, ps)
 
     # Save the XML data to disk if the game is over.
     fp = _xmlf % gobj.eid
-    if gobj.game_over() and not os.access(fp, os.R_OK):
+    if rawxml is not None and gobj.game_over() \
+            and not os.access(fp, os.R_OK):
         try:
-            print >> gzip.open(fp, 'w+'), rawxml,
-        except IOError:
+            _write_gzip(fp, rawxml)
+        except (IOError, OSError):
             _eprint('Could not cache XML data. Please make '
                     '"%s" writable.' % path.dirname(fp))
-    return ps
+    if rawxml is not None:
+        _write_disk_timings(gobj.eid, ts, stamp or _xml_stamp(gobj.eid))
+    return ts
+
+
+def _xml_stamp(eid):
+    """
+    Returns the modification time and size of the XML data on disk for
+    the game with the given `eid`, or `None` if it isn't on disk. This
+    is used to invalidate timings in the on disk cache.
+    """
+    try:
+        st = os.stat(_xmlf % eid)
+    except OSError:
+        return None
+    return [st.st_mtime, st.st_size]
+
+
+def _disk_timings_path(eid):
+    if not cache_dir:
+        return None
+    return path.join(cache_dir, 'timings', '%s.json' % eid)
+
+
+def _read_disk_timings(eid):
+    """
+    Returns the coach and broadcast timings for the game with the given
+    `eid` from the on disk cache, in the same format as
+    `nflvid._xml_timings`. If the timings aren't cached or if the XML
+    data they were parsed from has changed, then `None` is returned.
+    """
+    fp, stamp = _disk_timings_path(eid), _xml_stamp(eid)
+    if fp is None or stamp is None:
+        return None
+    try:
+        with open(fp) as f:
+            cached = json.load(f)
+    except (IOError, ValueError):
+        return None
+    if cached.get('version') != 1 or cached.get('source') != stamp:
+        return None
+
+    ts = {}
+    for coach, name in ((True, 'coach'), (False, 'broadcast')):
+        t = cached['timings'][name]
+        if t is None:
+            ts[coach] = None
+        else:
+            ts[coach] = _plays_from_ms(t['plays'], t['game_end'], coach)
+    return ts
+
+
+def _write_disk_timings(eid, ts, stamp):
+    """
+    Writes the coach and broadcast timings `ts` for the game with the
+    given `eid` to the on disk cache. `stamp` should be the result of
+    `nflvid._xml_stamp` for the XML data that `ts` was parsed from.
+    """
+    fp = _disk_timings_path(eid)
+    if fp is None or stamp is None:
+        return
+
+    cached = {'version': 1, 'source': stamp, 'timings': {}}
+    for coach, name in ((True, 'coach'), (False, 'broadcast')):
+        ps = ts[coach]
+        if ps is None:
+            cached['timings'][name] = None
+            continue
+        game_end = ps.values()[0].game_end if ps else None
+        cached['timings'][name] = {
+            'game_end': _playtime_ms(game_end),
+            'plays': [(p.playid, _playtime_ms(p.start), _playtime_ms(p.end))
+                      for p in ps.values()],
+        }
+
+    try:
+        _write_json(fp, cached)
+    except (IOError, OSError), e:
+        _eprint('Could not cache play timings in "%s": %s'
+                % (path.dirname(fp), e))
+
+
+def _read_json(fp):
+    """
+    Returns the JSON value in the file `fp`, or `None` if it could not
+    be read.
+    """
+    try:
+        with open(fp) as f:
+            return json.load(f)
+    except (IOError, ValueError):
+        return None
+
+
+def _write_json(fp, obj):
+    """
+    Writes `obj` as JSON to the file `fp`, creating its directory if
+    necessary. The file is replaced atomically, so that concurrent
+    processes never see a partially written file.
+    """
+    d = path.dirname(fp) or '.'
+    if not os.access(d, os.W_OK):
+        try:
+            os.makedirs(d)
+        except OSError:
+            if not path.isdir(d):
+                raise
+    tmp = tempfile.NamedTemporaryFile(dir=d, delete=False)
+    with tmp:
+        json.dump(obj, tmp)
+    os.chmod(tmp.name, 0644)
+    os.rename(tmp.name, fp)
 
 
 def play(gobj, playid, coach=True):
@@ -689,6 +2361,7 @@ class Play (object):
     Represents the start and end timings of single play in coach or
     broadcast footage.
     """
+    __slots__ = ('start', 'end', 'playid', 'game_end')
 
     def __init__(self, start, end, playid, game_end):
         self.start = start
@@ -726,90 +2399,304 @@ class Play (object):
         return '(%s, %s, %s)' % (self.playid, self.start, self.end)
 
 
+class TimingTable (object):
+    """
+    Holds the timings of every play in a game in columns of integer
+    milliseconds, so that the footage windows of all plays can be
+    computed at once without building `nflvid.PlayTime` objects.
+
+    Use `nflvid.TimingTable.from_plays` to build a table from
+    `nflvid.Play` objects, and `nflvid.TimingTable.plays` to go back.
+    """
+
+    def __init__(self, playids, starts, ends, game_end, coach=True):
+        self.playids = playids
+        """An `array` of play identifiers as integers."""
+
+        self.starts = starts
+        """An `array` of the start time of each play in milliseconds."""
+
+        self.ends = ends
+        """
+        An `array` of the end time of each play in milliseconds, or
+        `-1` if it isn't known.
+        """
+
+        self.game_end = game_end
+        """
+        The `endTime` of the broadcast footage in milliseconds, or `-1`
+        if it isn't known.
+        """
+
+        self.coach = coach
+        """Whether these are timings for coach footage."""
+
+    @staticmethod
+    def from_plays(plays, coach=True):
+        """
+        Returns a new table with the timings of the `nflvid.Play`
+        objects in `plays`, in the same order.
+        """
+        playids, starts, ends = _ms_array(), _ms_array(), _ms_array()
+        game_end = -1
+        for p in plays:
+            playids.append(int(p.playid))
+            starts.append(_playtime_ms(p.start))
+            ends.append(_playtime_ms(p.end))
+            game_end = _playtime_ms(p.game_end)
+        return TimingTable(playids, starts, ends, game_end, coach)
+
+    def plays(self):
+        """
+        Returns an ordered dictionary of `nflvid.Play` objects for
+        every play in the table, keyed by play id.
+        """
+        game_end = _playtime_from_ms(self.game_end, coach=False)
+        times = {}  # Plays usually end where the next one starts.
+
+        def playtime(ms):
+            if ms not in times:
+                times[ms] = _playtime_from_ms(ms, self.coach)
+            return times[ms]
+
+        d = OrderedDict()
+        for playid, start, end in zip(self.playids, self.starts, self.ends):
+            playid = str(playid)
+            d[playid] = Play(playtime(start), playtime(end), playid, game_end)
+        return d
+
+    def shifted(self, ms):
+        """
+        Returns a new table with `ms` milliseconds added to the start
+        and end of every play.
+        """
+        starts = _ms_array(st + ms for st in self.starts)
+        ends = _ms_array(-1 if et < 0 else et + ms for et in self.ends)
+        return TimingTable(self.playids, starts, ends, self.game_end,
+                           self.coach)
+
+    def durations(self):
+        """
+        Returns an `array` of the duration of each play in
+        milliseconds, or `-1` where the end of the play isn't known.
+        """
+        return _ms_array(-1 if et < 0 else et - st
+                         for st, et in zip(self.starts, self.ends))
+
+    def windows(self, max_duration=0, cut_scoreboard=True, offset=0):
+        """
+        Returns a pair of `array`s with the start time and duration, in
+        milliseconds, of the footage to slice for each play. The
+        parameters are the same as for `nflvid.slice_play`.
+        """
+        offset = int(round(offset * 1000))
+        max_ms = int(round(max_duration * 1000))
+        trim = 3000 if cut_scoreboard else 0
+        starts, durations = _ms_array(), _ms_array()
+        for st, et in zip(self.starts, self.ends):
+            st -= offset
+            if et < 0:  # Probably the last play of the game.
+                et = st + 40000
+            if max_duration > 0 \
+                    and _rounded_seconds(et) - _rounded_seconds(st) \
+                    > max_duration:
+                et = st + max_ms
+            starts.append(st + trim)
+            durations.append(et - st - trim)
+        return starts, durations
+
+    def __len__(self):
+        return len(self.playids)
+
+
+def _ms_array(values=()):
+    """
+    Returns an `array` of integers for a column of a
+    `nflvid.TimingTable`.
+    """
+    return array.array('i', values)
+
+
+def _rounded_seconds(ms):
+    """
+    Returns the milliseconds `ms` rounded to seconds like
+    `nflvid.PlayTime.seconds`.
+    """
+    secs, milli = divmod(ms, 1000)
+    return secs + 1 if milli >= 50 else secs
+
+
+class TimingCache (object):
+    """
+    A bounded cache of play timings, keyed by game eid and the kind of
+    footage (coach or broadcast). When the cache is full, the least
+    recently used timings are evicted.
+
+    A `TimingCache` is safe to use from multiple threads.
+    """
+
+    def __init__(self, maxsize=512):
+        self.maxsize = maxsize
+        """
+        The maximum number of entries to keep, where the coach and
+        broadcast timings of a game are separate entries. If this is
+        `None`, then the cache is unbounded.
+        """
+
+        self.hits = 0
+        """The number of lookups that found timings."""
+
+        self.misses = 0
+        """The number of lookups that didn't find timings."""
+
+        self.evictions = 0
+        """The number of entries evicted to stay within `maxsize`."""
+
+        self.__entries = OrderedDict()  # (eid, coach) -> play id -> Play
+        self.__lock = threading.Lock()
+
+    def get(self, eid, coach=True):
+        """
+        Returns the ordered dictionary of plays for the game with the
+        given `eid` and kind of footage, or `None` if it isn't cached.
+        """
+        key = (eid, coach)
+        with self.__lock:
+            ps = self.__entries.pop(key, None)
+            if ps is None:
+                self.misses += 1
+                return None
+            self.__entries[key] = ps  # Now the most recently used.
+            self.hits += 1
+            return ps
+
+    def put(self, eid, coach, plays):
+        """
+        Stores the ordered dictionary of `plays` for the game with the
+        given `eid` and kind of footage.
+        """
+        key = (eid, coach)
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = plays
+            while self.maxsize is not None \
+                    and len(self.__entries) > max(0, self.maxsize):
+                self.__entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all timings from the cache."""
+        with self.__lock:
+            self.__entries.clear()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __str__(self):
+        return 'TimingCache(size=%d, maxsize=%s, hits=%d, misses=%d, ' \
+               'evictions=%d)' % (len(self), self.maxsize, self.hits,
+                                  self.misses, self.evictions)
+
+
+timing_cache = TimingCache()
+"""
+The cache of play timings used by `nflvid.plays` and `nflvid.timings`.
+Its size can be changed by setting `nflvid.timing_cache.maxsize`.
+"""
+
+
 class PlayTime (object):
     """
     Represents a footage time point retrieved from the source XML
     meta data.
     """
-    __pdoc__['hh'] = 'The hour portion of the play time.'
-    __pdoc__['mm'] = 'The minutes portion of the play time.'
-    __pdoc__['ss'] = 'The seconds portion of the play time.'
-    __pdoc__['milli'] = 'The milliseconds portion of the play time.'
+    __slots__ = ('ms', '_coach')
 
-    def __init__(self, point=None, seconds=None):
+    def __init__(self, point=None, seconds=None, ms=None):
         """
         Construct a PlayTime object given a `point` in time in the
         format `HH:MM:SS:MMM` where `MMM` can be either 2 or 3 digits.
 
         Alternatively, `seconds` can be provided (which may be a
-        float).
+        float), or `ms` can be provided as integer milliseconds.
         """
-        if seconds is not None:
-            milli = int(1000 * (seconds - math.floor(seconds)))
+        self.ms = ms
+        """The time point in integer milliseconds."""
 
-            seconds = int(math.floor(seconds))
-            hh = seconds / 3600
+        # Whether the time is written with 3 digit milliseconds, like
+        # CATIN times, or 2 digits, like ArchiveTCIN times.
+        self._coach = True
 
-            seconds -= hh * 3600
-            mm = seconds / 60
-
-            seconds -= mm * 60
-            ss = seconds
-
-            self.hh, self.mm, self.ss, self.milli = hh, mm, ss, milli
-            self.__point = '%02d:%02d:%02d:%03d' % (hh, mm, ss, milli)
+        if ms is not None:
+            return
+        if seconds is not None:
+            whole = math.floor(seconds)
+            self.ms = int(whole) * 1000 + int(1000 * (seconds - whole))
             return
-
-        self.__point = point
-        self.__coach = False
 
         try:
-            parts = self.__point.split(':')
-            if len(parts[3]) == 3:
-                self.__coach = True
+            parts = point.split(':')
+            coach = len(parts[3]) == 3
             parts = map(int, parts)
         except ValueError:
-            assert False, 'Bad play time format: %s' % self.__point
+            assert False, 'Bad play time format: %s' % point
 
         if len(parts) != 4:
             assert False, 'Expected 4 parts but got %d in: %s' \
-                % (len(parts), self.__point)
+                % (len(parts), point)
 
-        self.hh, self.mm, self.ss, self.milli = parts
+        hh, mm, ss, milli = parts
 
         # I believe milliseconds is given in tens of milliseconds
         # for the ArchiveTCIN node. But the CATIN node (coach timing)
         # provides regular milliseconds.
-        if not self.__coach:
-            self.milli *= 10
+        if not coach:
+            milli *= 10
+        self.ms = (((hh * 60) + mm) * 60 + ss) * 1000 + milli
+        self._coach = coach
+
+    @property
+    def hh(self):
+        """The hour portion of the play time."""
+        return self.ms // (60 * 60 * 1000)
+
+    @property
+    def mm(self):
+        """The minutes portion of the play time."""
+        return (self.ms // (60 * 1000)) % 60
+
+    @property
+    def ss(self):
+        """The seconds portion of the play time."""
+        return (self.ms // 1000) % 60
+
+    @property
+    def milli(self):
+        """The milliseconds portion of the play time."""
+        return self.ms % 1000
 
     def add_seconds(self, seconds):
         """
         Returns a new PlayTime with `seconds` (int or float) added to
         self.
         """
-        return PlayTime(seconds=self.fractional() + seconds)
+        return PlayTime(ms=self.ms + int(round(seconds * 1000)))
 
     def seconds(self):
         """
         Returns this time point rounded to the nearest second.
         """
-        secs = (self.hh * 60 * 60) + (self.mm * 60) + self.ss
-        if self.milli >= 50:
-            secs += 1
-        return secs
+        return _rounded_seconds(self.ms)
 
     def fractional(self):
         """
         Returns this time point as fractional seconds based on
         milliseconds.
         """
-        secs = (self.hh * 60 * 60) + (self.mm * 60) + self.ss
-        secs = (1000 * secs) + self.milli
-        return float(secs) / 1000.0
+        return self.ms / 1000.0
 
     def __cmp__(self, other):
-        return cmp(self.fractional(), other.fractional())
+        return cmp(self.ms, other.ms)
 
     def __sub__(self, other):
         """
@@ -821,7 +2708,64 @@ class PlayTime (object):
         return int(round(self.fractional() - other.fractional()))
 
     def __str__(self):
-        return self.__point
+        hh, mm, ss, milli = self.hh, self.mm, self.ss, self.milli
+        if self._coach:
+            return '%02d:%02d:%02d:%03d' % (hh, mm, ss, milli)
+        return '%02d:%02d:%02d:%02d' % (hh, mm, ss, milli // 10)
+
+
+def video_durations(fps, jobs=4):
+    """
+    Returns an iterator of `(fp, duration)` pairs for the video file
+    paths in `fps`, in the same order. Each `duration` is a
+    `nflvid.PlayTime` object, or `None` if the duration could not be
+    read, which usually means the video is incomplete or corrupt.
+
+    Up to `jobs` videos are probed at once. Durations are remembered in
+    `nflvid.cache_dir` by path, size and modification time, so a video
+    that hasn't changed is never probed again.
+    """
+    cachef = path.join(cache_dir, 'durations.json') if cache_dir else None
+    cached = _read_duration_cache(cachef)
+    found = {}
+
+    def duration(fp):
+        try:
+            st = os.stat(fp)
+        except OSError:
+            return fp, None
+        key = path.abspath(fp)
+        stamp = [st.st_size, st.st_mtime]
+        if key in cached and cached[key][0:2] == stamp:
+            return fp, PlayTime(seconds=cached[key][2])
+        dur = _video_duration(fp)
+        if dur is not None:
+            found[key] = stamp + [dur.fractional()]
+        return fp, dur
+
+    pool = multiprocessing.pool.ThreadPool(jobs)
+    try:
+        for fp_dur in pool.imap(duration, fps):
+            yield fp_dur
+    finally:
+        pool.close()
+        if cachef is not None and found:
+            cached = _read_duration_cache(cachef)
+            cached.update(found)
+            try:
+                _write_json(cachef, {'version': 1, 'durations': cached})
+            except (IOError, OSError), e:
+                _eprint('Could not cache video durations in "%s": %s'
+                        % (cachef, e))
+
+
+def _read_duration_cache(fp):
+    if fp is None:
+        return {}
+    cached = _read_json(fp)
+    if cached is None or cached.get('version') != 1:
+        return {}
+    return cached['durations']
 
 
 def _video_duration(fp):
@@ -829,9 +2773,13 @@ def _video_duration(fp):
     Returns the duration of the entire video at file path `fp` as a
     `nflvid.PlayTime` object.
 
-    If there was a problem using `ffprobe` to get the duration, `None`
-    is returned.
+    The duration is read from the header of MP4 and MOV files. Other
+    containers are probed with `ffprobe`. If there was a problem using
+    `ffprobe` to get the duration, `None` is returned.
     """
+    seconds = _mp4_duration(fp)
+    if seconds is not None:
+        return PlayTime(seconds=seconds)
     cmd = ['ffprobe', '-loglevel', 'error', '-show_format', fp,
            '-print_format', 'json']
     out = _run_command(cmd)
@@ -840,7 +2788,69 @@ def _video_duration(fp):
     return PlayTime(seconds=float(json.loads(out)['format']['duration']))
 
 
-def _xml_plays(data, coach=True):
+def _mp4_duration(fp):
+    """
+    Returns the duration in seconds from the `moov/mvhd` box of the
+    MP4 or MOV file at `fp`. Only box headers are read, so this is fast
+    even when the `moov` box comes after the media data.
+
+    `None` is returned if `fp` isn't an MP4 file, or if it has no
+    `moov` box (which happens when a download is interrupted).
+    """
+    try:
+        with open(fp, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            moov = _mp4_box(f, 0, end, 'moov')
+            if moov is None:
+                return None
+            mvhd = _mp4_box(f, moov[0], moov[1], 'mvhd')
+            if mvhd is None:
+                return None
+            f.seek(mvhd[0])
+            data = f.read(min(mvhd[1] - mvhd[0], 32))
+    except IOError:
+        return None
+    if len(data) >= 20 and data[0] == '\x00':
+        timescale, duration = struct.unpack('>II', data[12:20])
+        unknown = 0xffffffff
+    elif len(data) >= 32 and data[0] == '\x01':
+        timescale, duration = struct.unpack('>IQ', data[20:32])
+        unknown = 0xffffffffffffffff
+    else:
+        return None
+    if timescale == 0 or duration == unknown:
+        return None
+    return duration / float(timescale)
+
+
+def _mp4_box(f, start, end, kind):
+    """
+    Returns the `(start, end)` offsets of the contents of the first box
+    of type `kind` in the file `f` between the `start` and `end` offsets,
+    or `None` if there is no such box.
+    """
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        try:
+            size, typ = struct.unpack('>I4s', f.read(8))
+            header = 8
+            if size == 1:
+                size, header = struct.unpack('>Q', f.read(8))[0], 16
+        except struct.error:  # The file ends in the middle of a header.
+            return None
+        if size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return None
+        if typ == kind:
+            return offset + header, offset + size
+        offset += size
+    return None
+
+
+def _xml_plays(data, coach=True, parser=None):
     """
     Parses the XML raw string `data` given into an ordered dictionary
     of `nflvid.Play` objects corresponding to coach play timings. If
@@ -849,65 +2859,165 @@ def _xml_plays(data, coach=True):
 
     The dictionary is keyed by play id.
 
-    A second return value, the ending time of the broadcast footage,
-    is also returned. (This is used to compute an offset between the
-    ArchiveTCIN time and when the play really starts.)
+    `parser` selects the XML parser to use and may be `etree` or `bs4`.
+    If it is `None`, then `nflvid.xml_parser` is used. If `etree` can't
+    parse the data (because it isn't well formed), then `bs4` is used
+    instead.
+    """
+    ts = _xml_timings(data, parser)
+    if ts is None:
+        return None
+    return ts[coach]
+
+
+def _xml_timings(data, parser=None):
+    """
+    Like `nflvid._xml_plays`, except the coach and broadcast timings
+    are both read in a single pass over `data`. A dictionary mapping
+    `True` to the coach timings and `False` to the broadcast timings is
+    returned.
+
+    If the timings for one kind of footage are malformed, then they are
+    `None` in the dictionary.
     """
     if data is None:
         return None
+
+    parser = parser or xml_parser
+    if parser == 'etree':
+        try:
+            game_end_time, rows = _xml_rows_etree(data)
+        except etree.ParseError:
+            game_end_time, rows = _xml_rows_bs4(data)
+    elif parser == 'bs4':
+        game_end_time, rows = _xml_rows_bs4(data)
+    else:
+        raise ValueError('Unknown XML parser "%s".' % parser)
+    if game_end_time is not None:
+        game_end_time = PlayTime(game_end_time)
+
+    ts = {}
+    for coach, col in ((True, 1), (False, 2)):
+        # Only rows with a timing for this kind of footage are used. We
+        # need all of them to look ahead to the next play's start time to
+        # compute the current play's duration.
+        try:
+            timed = [(row[0], PlayTime(row[col]), row[3])
+                     for row in rows if row[col]]
+        except (AssertionError, IndexError) as e:
+            _eprint('Could not read %s timings: %s'
+                    % ('coach' if coach else 'broadcast', e))
+            ts[coach] = None
+            continue
+
+        d = OrderedDict()
+        for i, (playid, start, ignore) in enumerate(timed):
+            if ignore:
+                continue
+            end = None
+            if i < len(timed) - 1:
+                end = timed[i+1][1]
+            d[playid] = Play(start, end, playid, game_end_time)
+        ts[coach] = d
+    return ts
+
+
+def _xml_rows_etree(data):
+    """
+    Returns the game end time and a list of rows from the XML raw
+    string `data`, where each row is a tuple of play id, coach start
+    time, broadcast start time and whether the row should be ignored.
+    Times are returned as strings, and a start time is empty if the
+    row doesn't have one.
+
+    The rows are read with an incremental parser, and each row is
+    thrown away as soon as its timings have been read.
+    """
+    game_end_time = None
+    rows = []
+
+    parents = []
+    for event, elem in etree.iterparse(StringIO(data), ('start', 'end')):
+        if event == 'start':
+            if not parents and elem.tag.lower() == 'dataset':
+                attrs = _lower_attrs(elem.attrib)
+                if attrs.get('endtime', None) is not None:
+                    game_end_time = attrs['endtime'].strip()
+            parents.append(elem)
+            continue
+
+        parents.pop()
+        if elem.tag.lower() != 'row':
+            continue
+
+        found = {}
+        for child in elem.iter():
+            tag = child.tag.lower()
+            if tag in ('id', 'catin', 'archivetcin') and tag not in found:
+                found[tag] = ''.join(child.itertext()).strip()
+        attrs = _lower_attrs(elem.attrib)
+        playid = found.get('id', '') or attrs.get('playid', '').strip()
+        coach = found.get('catin', '')
+        broadcast = found.get('archivetcin', '')
+        if playid and (coach or broadcast):
+            rows.append((playid, coach, broadcast, _ignore_row(attrs)))
+
+        # All of the row's predecessors have been read, so free them.
+        if parents:
+            del parents[-1][:]
+    return game_end_time, rows
+
+
+def _xml_rows_bs4(data):
+    """
+    Like `nflvid._xml_rows_etree`, except it uses BeautifulSoup, which
+    is much slower but more lenient with malformed data.
+    """
     soup = bs4.BeautifulSoup(data)
 
     game_end_time = soup.find('dataset').get('endtime', None)
     if game_end_time is not None:
-        game_end_time = PlayTime(game_end_time.strip())
+        game_end_time = game_end_time.strip()
+
+    def text(row, tag):
+        node = row.find(tag)
+        if not node:
+            return ''
+        return node.get_text().strip()
 
-    # Load everything into a list first, since we need to look ahead to see
-    # the next play's start time to compute the current play's duration.
     rows = []
     for row in soup.find_all('row'):
-        playid = row.find('id')
-        if not playid:
-            playid = row.get('playid', None)
-            if not playid:
-                continue
-            playid = playid.strip()
-        else:
-            playid = playid.get_text().strip()
+        playid = text(row, 'id') or row.get('playid', '').strip()
+        coach, broadcast = text(row, 'catin'), text(row, 'archivetcin')
+        if playid and (coach or broadcast):
+            rows.append((playid, coach, broadcast, _ignore_row(row.attrs)))
+    return game_end_time, rows
 
-        if coach:
-            start = row.find('catin')
-        else:
-            start = row.find('archivetcin')
-        if not start:
-            continue
-        start = PlayTime(start.get_text().strip())
-        rows.append((playid, start, row))
-
-    # A predicate for determining whether to ignore a row or not in our final
-    # result set. For example, timeouts take a lot of time but aren't needed
-    # for play-by-play footage.
-    def ignore(row):
-        if 'playdescription' in row.attrs:
-            if row['playdescription'].lower().startswith('timeout'):
-                return True
-            if row['playdescription'].lower().startswith('two-minute'):
-                return True
-
-        # Did we miss anything?
-        if 'preplaybyplay' in row.attrs:
-            if row['preplaybyplay'].lower().startswith('timeout'):
-                return True
-        return False
 
-    d = OrderedDict()
-    for i, (playid, start, row) in enumerate(rows):
-        if ignore(row):
-            continue
-        end = None
-        if i < len(rows) - 1:
-            end = rows[i+1][1]
-        d[playid] = Play(start, end, playid, game_end_time)
-    return d
+def _ignore_row(attrs):
+    """
+    A predicate for determining whether to ignore a row or not in our
+    final result set. For example, timeouts take a lot of time but
+    aren't needed for play-by-play footage.
+
+    `attrs` should be a dictionary of the row's attributes with
+    lowercase keys.
+    """
+    if 'playdescription' in attrs:
+        if attrs['playdescription'].lower().startswith('timeout'):
+            return True
+        if attrs['playdescription'].lower().startswith('two-minute'):
+            return True
+
+    # Did we miss anything?
+    if 'preplaybyplay' in attrs:
+        if attrs['preplaybyplay'].lower().startswith('timeout'):
+            return True
+    return False
+
+
+def _lower_attrs(attrs):
+    return dict((k.lower(), v) for k, v in attrs.iteritems())
 
 
 def _get_xml_data(eid=None, gamekey=None, fpath=None):
@@ -933,12 +3043,7 @@ def _get_xml_data(eid=None, gamekey=None, fpath=None):
     if os.access(fpath, os.R_OK):
         return gzip.open(fpath).read()
 
-    year = int(eid[0:4])
-    month = int(eid[4:6])
-    if month <= 3:
-        year -= 1
-    base = _xml_base_urls.get(str(year), _xml_base_urls['default'])
-    u = base % (year, gamekey)  # The year and the game key.
+    u = _xml_url(eid, gamekey)
     try:
         return urllib2.urlopen(u, timeout=10).read()
     except urllib2.HTTPError, e:
@@ -948,9 +3053,450 @@ def _get_xml_data(eid=None, gamekey=None, fpath=None):
     return None
 
 
-def _is_avconv():
+def _xml_url(eid, gamekey, base=None):
+    """
+    Returns the URL of the XML play data for the game given. `base`
+    overrides the URL format, which is given the season year and the
+    game key.
+    """
+    year = int(eid[0:4])
+    month = int(eid[4:6])
+    if month <= 3:
+        year -= 1
+    if base is None:
+        base = _xml_base_urls.get(str(year), _xml_base_urls['default'])
+    return base % (year, gamekey)  # The year and the game key.
+
+
+def sync_xml(games, xml_dir=None, jobs=8, refresh=False, base_url=None,
+             game_over=None):
+    """
+    Downloads the XML play data of many games at once and saves it,
+    gzipped, in `xml_dir`, which defaults to the `pbp-xml` directory
+    that comes with `nflvid`. `games` should be a list of `(eid,
+    gamekey)` pairs. Up to `jobs` downloads run at once, and each
+    thread reuses its HTTP connection.
+
+    An iterator of `(eid, status, size)` triples is returned in the
+    same order as `games`, where `size` is the number of bytes
+    downloaded and `status` is one of `saved`, `exists` (the file was
+    already on disk), `unfinished`, `unchanged`, `missing` (the server
+    doesn't have it) or `failed`.
+
+    Only the XML of games that are over is saved, since the timings of
+    a game in progress are incomplete and XML on disk is trusted from
+    then on. `game_over` is called with the eid of every game that
+    would be downloaded, and games for which it returns `False` are
+    skipped as `unfinished`. It defaults to asking `nflgame`.
+
+    Games that are already on disk are skipped unless `refresh` is
+    `True`. In that case they are requested again with the `ETag` and
+    `Last-Modified` validators from the last download, which are kept
+    in `nflvid.cache_dir`, so only data that changed is downloaded.
+
+    Files are written atomically and the XML isn't parsed. Rebuild the
+    timing index with `nflvid.build_timing_index` afterwards.
+
+    `base_url` overrides the URL format (see `nflvid._xml_url`), which
+    is useful for testing against a local server.
+    """
+    xml_dir = xml_dir or path.dirname(_xmlf)
+    cachef = path.join(cache_dir, 'pbp-xml-validators.json') \
+        if cache_dir else None
+    validators = (_read_json(cachef) or {}) if cachef else {}
+    found = {}
+
+    def sync(game):
+        eid, gamekey = game
+        fp = path.join(xml_dir, '%s.xml.gz' % eid)
+        headers = {}
+        if os.access(fp, os.R_OK) and not refresh:
+            return eid, 'exists', 0
+        if not (game_over or _game_over)(eid):
+            return eid, 'unfinished', 0
+        if os.access(fp, os.R_OK):
+            v = validators.get(eid, {})
+            if v.get('etag'):
+                headers['if-none-match'] = v['etag']
+            if v.get('last-modified'):
+                headers['if-modified-since'] = v['last-modified']
+        u = _xml_url(eid, gamekey, base_url)
+        try:
+            resp, content = _http().request(u, headers=headers)
+        except (socket.error, httplib2.HttpLib2Error), e:
+            _eprint('%s (%s)' % (e, u))
+            return eid, 'failed', 0
+        if resp.status == 304:
+            return eid, 'unchanged', 0
+        if resp.status == 404:
+            return eid, 'missing', 0
+        if resp.status != 200:
+            _eprint('HTTP %d (%s)' % (resp.status, u))
+            return eid, 'failed', 0
+        try:
+            _write_gzip(fp, content)
+        except (IOError, OSError), e:
+            _eprint('Could not save XML data to "%s": %s' % (fp, e))
+            return eid, 'failed', len(content)
+        found[eid] = {'etag': resp.get('etag'),
+                      'last-modified': resp.get('last-modified')}
+        return eid, 'saved', len(content)
+
+    pool = multiprocessing.pool.ThreadPool(jobs)
+    try:
+        for result in pool.imap(sync, games):
+            yield result
+    finally:
+        pool.close()
+        if cachef is not None and found:
+            validators = _read_json(cachef) or {}
+            validators.update(found)
+            try:
+                _write_json(cachef, validators)
+            except (IOError, OSError), e:
+                _eprint('Could not cache XML validators in "%s": %s'
+                        % (cachef, e))
+
+
+def _game_over(eid):
+    """
+    Returns whether the game with the given `eid` is over according to
+    `nflgame`. Games scheduled after today aren't looked up at all.
+    """
+    if eid[0:8] > time.strftime('%Y%m%d'):
+        return False
+
+    import nflgame
+    g = nflgame.game.Game(eid)
+    return g is not None and g.game_over()
+
+
+def _write_gzip(fp, data):
+    """
+    Writes `data` gzipped to the file `fp`. The file is replaced
+    atomically, so an interrupted write never leaves a truncated file.
+    """
+    tmp = tempfile.NamedTemporaryFile(dir=path.dirname(fp) or '.',
+                                      delete=False)
+    try:
+        with tmp:
+            gz = gzip.GzipFile(fileobj=tmp, mode='wb')
+            try:
+                gz.write(data)
+            finally:
+                gz.close()
+        os.chmod(tmp.name, 0644)
+        os.rename(tmp.name, fp)
+    except (IOError, OSError):
+        try:
+            os.unlink(tmp.name)
+        except OSError:
+            pass
+        raise
+
+
+# The timing index is a single binary file with play timings for every
+# game in the pbp-xml directory. It's laid out so that it can be memory
+# mapped and searched without parsing anything up front:
+#
+#   header:    magic, version, number of directory entries
+#   directory: one entry per (eid, mode), sorted, each with the game end
+#              time, a slice into the records section and the CRC32 and
+#              size of the XML data it was built from
+#   records:   (playid, start, end) triples in the order of the XML rows
+#
+# All times are stored as integer milliseconds, where `-1` means `None`.
+_index_magic = 'NFLV'
+_index_version = 2
+_index_header = struct.Struct('<4sII')
+# eid, mode, game_end, offset, count, XML CRC32, XML size
+_index_entry = struct.Struct('<10sBiIIII')
+_index_record = struct.Struct('<iii')  # playid, start, end
+_index_modes = {True: 0, False: 1}  # coach -> mode
+
+
+def build_timing_index(xml_dir=None, outpath=None):
+    """
+    Builds a binary index of the coach and broadcast play timings of
+    every game in `xml_dir`, which should be a directory of gzipped XML
+    files named `{eid}.xml.gz`. The index is written to `outpath`.
+
+    When `xml_dir` and `outpath` are `None`, the bundled `pbp-xml`
+    directory is indexed and the index is written to where
+    `nflvid.plays` looks for it.
+
+    Games whose XML data cannot be parsed are left out of the index,
+    which means their timings will be read from XML as usual. So are
+    games whose XML data in the `pbp-xml` directory changes after the
+    index is built (e.g., by `nflvid.sync_xml`), until it is built
+    again.
+
+    The number of games indexed is returned.
+    """
+    xml_dir = xml_dir or path.dirname(_xmlf)
+    outpath = outpath or _indexf
+
+    entries, records = [], []
+    for fname in sorted(os.listdir(xml_dir)):
+        if not fname.endswith('.xml.gz'):
+            continue
+        eid = fname[0:10]
+        rawxml = _get_xml_data(fpath=path.join(xml_dir, fname))
+        source = _gzip_fingerprint(path.join(xml_dir, fname)) or (0, 0)
+        for coach, ps in sorted(_xml_timings(rawxml).items(), reverse=True):
+            rows = None
+            if ps is not None:
+                try:
+                    rows = [(int(p.playid), _playtime_ms(p.start),
+                             _playtime_ms(p.end)) for p in ps.values()]
+                except ValueError:  # Play ids must be numbers.
+                    pass
+            if rows is None:
+                _eprint('Could not index %s timings for game %s.'
+                        % ('coach' if coach else 'broadcast', eid))
+                continue
+
+            # Games without timings are recorded too, so that looking
+            # them up doesn't fall back to parsing XML.
+            game_end = ps.values()[0].game_end if ps else None
+            entries.append((eid, _index_modes[coach], _playtime_ms(game_end),
+                            len(records), len(rows)) + source)
+            records.extend(rows)
+
+    tmp = tempfile.NamedTemporaryFile(dir=path.dirname(outpath) or '.',
+                                      delete=False)
+    with tmp:
+        tmp.write(_index_header.pack(_index_magic, _index_version,
+                                     len(entries)))
+        for entry in entries:
+            tmp.write(_index_entry.pack(*entry))
+        for record in records:
+            tmp.write(_index_record.pack(*record))
+    os.chmod(tmp.name, 0644)
+    os.rename(tmp.name, outpath)
+    return len(set(e[0] for e in entries))
+
+
+def _indexed_plays(eid, coach=True):
+    """
+    Returns an ordered dictionary of `nflvid.Play` objects for the game
+    with the given `eid` from the timing index. If the index doesn't
+    exist or doesn't contain the game, then `None` is returned.
+
+    `None` is also returned if the game's XML data on disk isn't the
+    data that the index was built from, since it is then out of date.
+    """
+    global _index
+
+    if _index is None:
+        try:
+            with open(_indexf, 'rb') as f:
+                _index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, OSError, ValueError):
+            _index = False
+            return None
+        magic, version, _ = _index_header.unpack_from(_index, 0)
+        if magic != _index_magic or version != _index_version:
+            _eprint('Ignoring timing index "%s" with an unknown format.'
+                    % _indexf)
+            _index = False
+    if not _index:
+        return None
+
+    _, _, count = _index_header.unpack_from(_index, 0)
+    start_dir = _index_header.size
+    start_records = start_dir + (count * _index_entry.size)
+    key = (eid, _index_modes[coach])
+
+    def entry_at(i):
+        return _index_entry.unpack_from(_index,
+                                        start_dir + i * _index_entry.size)
+
+    lo, hi = 0, count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if entry_at(mid)[0:2] < key:
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo >= count or entry_at(lo)[0:2] != key:
+        return None
+
+    _, _, game_end, offset, nplays, crc, size = entry_at(lo)
+    source = _gzip_fingerprint(_xmlf % eid)
+    if source is not None and source != (crc, size):
+        return None
+    pos = start_records + (offset * _index_record.size)
+    rows = (_index_record.unpack_from(_index, pos + i * _index_record.size)
+            for i in xrange(nplays))
+    return _plays_from_ms(rows, game_end, coach)
+
+
+def _gzip_fingerprint(fp):
+    """
+    Returns the CRC32 and size of the data in the gzip file `fp`, or
+    `None` if it can't be read. Both are stored at the end of the file,
+    so this is cheap. Unlike a modification time, they don't change
+    when the file is copied (e.g., when `nflvid` is installed) or
+    compressed again.
+    """
+    try:
+        with open(fp, 'rb') as f:
+            f.seek(-8, os.SEEK_END)
+            return struct.unpack('<II', f.read(8))
+    except (IOError, OSError, struct.error):
+        return None
+
+
+def _plays_from_ms(rows, game_end, coach=True):
+    """
+    Returns an ordered dictionary of `nflvid.Play` objects from `rows`
+    of `(playid, start, end)` triples, where the times (and
+    `game_end`) are in milliseconds as returned by
+    `nflvid._playtime_ms`.
+    """
+    playids, starts, ends = _ms_array(), _ms_array(), _ms_array()
+    for playid, start, end in rows:
+        playids.append(int(playid))
+        starts.append(start)
+        ends.append(end)
+    return TimingTable(playids, starts, ends, game_end, coach).plays()
+
+
+def _playtime_ms(pt):
+    """
+    Returns the `nflvid.PlayTime` given as integer milliseconds, or
+    `-1` if `pt` is `None`.
+    """
+    if pt is None:
+        return -1
+    return pt.ms
+
+
+def _playtime_from_ms(ms, coach=True):
+    """
+    The inverse of `nflvid._playtime_ms`. The `nflvid.PlayTime`
+    returned is formatted like `CATIN` times when `coach` is `True`
+    and like `ArchiveTCIN` times otherwise.
+    """
+    if ms < 0:
+        return None
+    pt = PlayTime(ms=ms)
+    pt._coach = coach or ms % 10 != 0
+    return pt
+
+
+def toolchain():
+    """
+    Returns a dictionary describing the external programs used by
+    `nflvid`. It maps each of `ffmpeg`, `ffprobe`, `rtmpdump` and
+    `convert` to `None` if the program isn't on `PATH`, or to a
+    dictionary with its `path` and `version` (the first line of its
+    version output).
+
+    The entry for `ffmpeg` also has these keys: `avconv` is `True` if
+    the binary is really `avconv`; `bsf` is the list of arguments that
+    applies the `aac_adtstoasc` audio bitstream filter; and `timeout`
+    is the list of arguments (possibly empty) that makes network input
+    time out.
+
+    Programs are probed once per process, and the results are
+    remembered in `nflvid.cache_dir` by the path and modification time
+    of each binary, so they are only probed again when a program is
+    upgraded.
+    """
+    global _toolchain
+
+    with _toolchain_lock:
+        if _toolchain is not None:
+            return _toolchain
+        fp = path.join(cache_dir, 'toolchain.json') if cache_dir else None
+        cached = _read_json(fp) if fp is not None else None
+        if cached is None or cached.get('version') != 1:
+            cached = {'version': 1, 'tools': {}}
+
+        tools, changed = {}, False
+        for name in ('ffmpeg', 'ffprobe', 'rtmpdump', 'convert'):
+            binary = _which(name)
+            if binary is None:
+                tools[name] = None
+                continue
+            key = '%s:%s' % (binary, os.stat(binary).st_mtime)
+            if key not in cached['tools']:
+                cached['tools'][key] = _probe_tool(name, binary)
+                changed = True
+            tools[name] = cached['tools'][key]
+        if fp is not None and changed:
+            try:
+                _write_json(fp, cached)
+            except (IOError, OSError), e:
+                _eprint('Could not cache toolchain in "%s": %s' % (fp, e))
+        _toolchain = tools
+        return _toolchain
+
+
+def _probe_tool(name, binary):
+    """
+    Runs the program `name` at the path `binary` to find its version
+    and the options it supports. See `nflvid.toolchain`.
+    """
+    version = {'ffmpeg': ['-version'], 'ffprobe': ['-version'],
+               'rtmpdump': ['-h'], 'convert': ['-version']}[name]
+    out = _command_output([binary] + version)
+    lines = [line for line in out.splitlines() if line.strip()]
+    if name == 'rtmpdump':
+        lines = [line for line in lines if 'RTMPDump' in line]
+    tool = {'path': binary, 'version': lines[0].strip() if lines else None}
+    if name == 'ffmpeg':
+        opts = _command_output([binary, '-h', 'full'])
+        tool['avconv'] = 'DEPRECATED' in out
+        if '\n-bsf' in opts:
+            tool['bsf'] = ['-bsf:a', 'aac_adtstoasc']
+        else:
+            tool['bsf'] = ['-absf', 'aac_adtstoasc']
+        # Newer versions take `-timeout` in microseconds, which would
+        # make every read time out.
+        if '-rw_timeout' in opts:
+            tool['timeout'] = ['-rw_timeout', '120000000']
+        elif '-timeout' in opts and not tool['avconv']:
+            tool['timeout'] = ['-timeout', '120']
+        else:
+            tool['timeout'] = []
+    return tool
+
+
+def _command_output(cmd):
+    """
+    Returns the stdout and stderr of `cmd` regardless of its exit
+    status, or an empty string if it could not be run.
+    """
+    try:
+        p = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                             stderr=subprocess.STDOUT)
+        return p.communicate()[0]
+    except OSError:
+        return ''
+
+
+def _which(name):
+    """
+    Returns the path of the executable `name` on `PATH`, or `None`.
+    """
+    for d in os.getenv('PATH', os.defpath).split(os.pathsep):
+        fp = path.join(d, name)
+        if os.access(fp, os.X_OK) and not path.isdir(fp):
+            return fp
+    return None
+
+
+def _ffmpeg_args(key):
     """
-    Returns `True` if the `ffmpeg` binary is really `avconv`.
+    Returns the `ffmpeg` arguments for the option `key` from
+    `nflvid.toolchain`. If `ffmpeg` couldn't be found, then the
+    arguments that have always been used are returned, so that the
+    error is reported when `ffmpeg` is run.
     """
-    out = _run_command(['ffmpeg', '-version'])
-    return out and isinstance(out, strtype) and 'DEPRECATED' in out
+    ffmpeg = toolchain()['ffmpeg']
+    if ffmpeg is None:
+        return {'bsf': ['-absf', 'aac_adtstoasc'], 'timeout': []}[key]
+    return ffmpeg[key]
@@ -0,0 +1,329 @@
+'''
+This submodule downloads broadcast footage from an HTTP Live Streaming
+(HLS) playlist one segment at a time, instead of handing the playlist
+to a single `ffmpeg` process.
+
+Segments are fetched in parallel and saved in a directory next to the
+footage, e.g., `{footage_dir}/{eid}.hls`, along with a manifest of the
+segments that have been downloaded. If a download is interrupted, then
+running it again only fetches the segments that are missing. Once every
+segment is on disk, they are remuxed into `{footage_dir}/{eid}.mp4` and
+the segment directory is removed.
+
+Most users will want `nflvid.download_broadcast` with
+`resumable=True`, which uses `nflvid.hls.download`.
+'''
+
+from __future__ import absolute_import, division, print_function
+import multiprocessing.pool
+import os
+import os.path as path
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urlparse
+
+import httplib2
+
+import nflvid
+
+
+retries = 3
+"""
+The number of times to try downloading a segment before giving up on
+the download. The footage can be resumed later.
+"""
+
+
+def segments(url):
+    """
+    Returns a list of `(url, duration)` pairs, one for every media
+    segment in the HLS playlist at `url`. Durations are in seconds.
+    If the playlist is a master playlist, then the segments of the
+    variant with the highest bandwidth are returned.
+
+    If the playlist could not be read, or if its segments are
+    encrypted, then `None` is returned.
+    """
+    data = _get(url)
+    if data is None:
+        nflvid._eprint('Could not fetch HLS playlist "%s"' % url)
+        return None
+    lines = [line.strip() for line in data.splitlines()]
+    if not lines or not lines[0].startswith('#EXTM3U'):
+        nflvid._eprint('"%s" is not an HLS playlist' % url)
+        return None
+
+    variants, segs, duration = [], [], None
+    for i, line in enumerate(lines):
+        if line.startswith('#EXT-X-STREAM-INF:'):
+            attrs = _attrs(line.split(':', 1)[1])
+            for uri in lines[i+1:]:
+                if uri and not uri.startswith('#'):
+                    try:
+                        bandwidth = int(attrs.get('BANDWIDTH', 0))
+                    except ValueError:
+                        bandwidth = 0
+                    variants.append((bandwidth, urlparse.urljoin(url, uri)))
+                    break
+        elif line.startswith('#EXT-X-KEY:'):
+            if _attrs(line.split(':', 1)[1]).get('METHOD', 'NONE') != 'NONE':
+                nflvid._eprint('HLS playlist "%s" is encrypted' % url)
+                return None
+        elif line.startswith('#EXTINF:'):
+            try:
+                duration = float(line.split(':', 1)[1].split(',')[0])
+            except ValueError:
+                duration = 0.0
+        elif line and not line.startswith('#') and duration is not None:
+            segs.append((urlparse.urljoin(url, line), duration))
+            duration = None
+    if variants:
+        return segments(max(variants)[1])
+    return segs
+
+
+def download(url, outpath, jobs=4, dry_run=False):
+    """
+    Downloads the footage in the HLS playlist at `url` to `outpath`
+    with `jobs` segments downloading at once. `True` is returned if
+    and only if `outpath` was written.
+
+    Segments are kept in `{outpath without extension}.hls` until all
+    of them are downloaded, so a failed download can be resumed by
+    calling this function again. `outpath` is only created once the
+    full footage has been remuxed, so it is never left incomplete.
+
+    If `dry_run` is `True`, then only the segments that make up the
+    first 30 seconds of the footage are downloaded.
+    """
+    segs = segments(url)
+    if not segs:
+        return False
+    if dry_run:
+        total = 0.0
+        for i, (_, duration) in enumerate(segs):
+            total += duration
+            if total >= 30:
+                segs = segs[0:i+1]
+                break
+
+    workdir = path.splitext(outpath)[0] + '.hls'
+    manifest = path.join(workdir, 'manifest.json')
+    if not path.isdir(workdir):
+        try:
+            os.makedirs(workdir)
+        except OSError as e:
+            nflvid._eprint('Could not create "%s": %s' % (workdir, e))
+            return False
+    state = _read_manifest(manifest, url, segs)
+    todo = [i for i in xrange(len(segs)) if i not in state['done']]
+    if len(todo) < len(segs):
+        nflvid._eprint('Resuming download of "%s": %d of %d segments are '
+                       'already done.'
+                       % (outpath, len(segs) - len(todo), len(segs)))
+
+    lock = threading.Lock()
+
+    def fetch(i):
+        size = _fetch_segment(segs[i][0], _segment_path(workdir, i))
+        if size is None:
+            return False
+        with lock:
+            state['done'][i] = size
+            _write_manifest(manifest, state)
+        return True
+
+    if todo:
+        pool = multiprocessing.pool.ThreadPool(jobs)
+        try:
+            ok = all(pool.map(fetch, todo))
+        finally:
+            pool.close()
+        if not ok:
+            nflvid._eprint('Some segments of "%s" could not be downloaded. '
+                           'Run the download again to resume it.' % outpath)
+            return False
+    files = [_segment_path(workdir, i) for i in xrange(len(segs))]
+    if not _remux(files, outpath):
+        return False
+    shutil.rmtree(workdir, ignore_errors=True)
+    return True
+
+
+def fetch_window(segs, start, duration, outpath, jobs=4):
+    """
+    Downloads only the segments in `segs`, as returned by
+    `nflvid.hls.segments`, that cover the `duration` seconds of footage
+    starting `start` seconds into the playlist. The footage is trimmed
+    to that window and written to `outpath`. `True` is returned if and
+    only if `outpath` was written.
+
+    This is how single plays of broadcast footage are fetched without
+    downloading the whole game.
+    """
+    end = start + duration
+    offset, window = 0.0, []
+    for i, (url, seglen) in enumerate(segs):
+        if offset + seglen > start and offset < end:
+            if not window:
+                first = offset
+            window.append(url)
+        offset += seglen
+    if not window:
+        nflvid._eprint('There is no footage between %.3fs and %.3fs.'
+                       % (start, end))
+        return False
+
+    workdir = tempfile.mkdtemp(prefix='.fetch-', dir=path.dirname(outpath))
+    try:
+        files = [_segment_path(workdir, i) for i in xrange(len(window))]
+        pool = multiprocessing.pool.ThreadPool(min(jobs, len(window)))
+        try:
+            sizes = pool.map(lambda uf: _fetch_segment(*uf),
+                             zip(window, files))
+        finally:
+            pool.close()
+        if None in sizes:
+            return False
+        return _remux(files, outpath, start - first, duration)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def _remux(files, outpath, start=None, duration=None):
+    """
+    Feeds the segment `files`, in order, through `ffmpeg` to write an
+    MP4 file at `outpath`. If `start` and `duration` are given, then
+    only that window (in seconds) of the footage is kept.
+    """
+    tmp = path.join(path.dirname(files[0]), 'remux.mp4')
+    cmd = ['ffmpeg', '-y', '-f', 'mpegts', '-i', 'pipe:0']
+    if start is not None:
+        cmd += ['-ss', '%.3f' % start, '-t', '%.3f' % duration]
+    cmd += nflvid._ffmpeg_args('bsf')
+    cmd += [
+        '-acodec', 'copy',
+        '-vcodec', 'copy',
+        '-f', 'mp4', tmp,
+    ]
+    output = tempfile.TemporaryFile()
+    try:
+        p = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                             stdout=output, stderr=subprocess.STDOUT)
+    except OSError as e:
+        nflvid._eprint("Could not run '%s' (errno: %d): %s"
+                       % (' '.join(cmd), e.errno, e.strerror))
+        return False
+    try:
+        for fp in files:
+            with open(fp, 'rb') as f:
+                shutil.copyfileobj(f, p.stdin)
+        p.stdin.close()
+    except IOError as e:
+        # ffmpeg stops reading once it has the window it wants.
+        if start is None:
+            nflvid._eprint('Could not remux segments in "%s": %s'
+                           % (path.dirname(tmp), e))
+            p.kill()
+            p.wait()
+            return False
+    if p.wait() != 0:
+        output.seek(0)
+        nflvid._eprint("Could not run '%s' (exit code %d):\n%s"
+                       % (' '.join(cmd), p.returncode, output.read().strip()))
+        return False
+    os.rename(tmp, outpath)
+    return True
+
+
+def _fetch_segment(url, fp):
+    """
+    Downloads the segment at `url` to `fp` and returns its size in
+    bytes, or `None` if it could not be downloaded.
+    """
+    for attempt in xrange(retries):
+        if attempt > 0:
+            time.sleep(2 ** attempt)
+        data = _get(url)
+        if data is None:
+            continue
+        try:
+            tmp = tempfile.NamedTemporaryFile(dir=path.dirname(fp),
+                                              delete=False)
+            with tmp:
+                tmp.write(data)
+            os.rename(tmp.name, fp)
+        except (IOError, OSError) as e:
+            nflvid._eprint('Could not write HLS segment "%s": %s' % (fp, e))
+            return None
+        return len(data)
+    nflvid._eprint('Could not download HLS segment "%s"' % url)
+    return None
+
+
+def _get(url):
+    try:
+        resp, content = nflvid._http().request(url)
+    except (socket.error, httplib2.HttpLib2Error):
+        return None
+    if resp.status != 200:
+        return None
+    return content
+
+
+def _read_manifest(manifest, url, segs):
+    """
+    Returns the download state in `manifest` if it is for the same
+    playlist, with only the segments that are still on disk marked as
+    done. Otherwise, a fresh state is returned.
+    """
+    state = nflvid._read_json(manifest)
+    fresh = {'version': 1, 'url': url, 'segments': len(segs), 'done': {}}
+    if state is None or state.get('version') != 1 \
+            or state.get('url') != url or state.get('segments') != len(segs):
+        return fresh
+    workdir = path.dirname(manifest)
+    for i, size in state['done'].iteritems():
+        try:
+            if os.stat(_segment_path(workdir, int(i))).st_size == size:
+                fresh['done'][int(i)] = size
+        except OSError:
+            pass
+    return fresh
+
+
+def _write_manifest(manifest, state):
+    try:
+        nflvid._write_json(manifest, state)
+    except (IOError, OSError) as e:
+        nflvid._eprint('Could not write HLS manifest "%s": %s'
+                       % (manifest, e))
+
+
+def _segment_path(workdir, i):
+    return path.join(workdir, '%05d.ts' % i)
+
+
+def _attrs(s):
+    """
+    Parses an HLS attribute list, e.g., `BANDWIDTH=1600000,...`, into a
+    dictionary.
+    """
+    attrs, key, val, quoted = {}, None, '', False
+    for part in s.split(','):
+        if key is not None:  # Inside a quoted value with a comma.
+            val += ',' + part
+        elif '=' in part:
+            key, val = part.split('=', 1)
+            key = key.strip()
+        else:
+            continue
+        quoted = val.count('"') % 2 == 1
+        if not quoted:
+            attrs[key] = val.strip().strip('"')
+            key, val = None, ''
+    return attrs
@@ -147,36 +147,61 @@ def _strip_time(desc):
     return re.sub('^\([^)]+\)', '', desc).strip()
 
 
-def _play_path(footage_play_dir, play):
-    return nflvid.footage_play(footage_play_dir, play.gsis_id, play.play_id)
-
-
-def plays_and_paths(plays, footage_play_dir=None):
+def plays_and_paths(plays, footage_play_dir=None, pending=()):
     """
     Given a list of `nfldb.Play` objects, return an association list
     with `nfldb.Play` objects and their corresponding file paths of
     the video of the play.
 
     Note that the returned association list may have fewer items than
-    `plays` since some plays may not have any footage.
+    `plays` since some plays may not have any footage. A line is
+    printed for each of them. Use `nflvid.vlc.resolve_plays` to get
+    the missing plays as a list instead.
 
     If `footage_play_dir` is `None`, then the value of the
     `NFLVID_FOOTAGE_PLAY_DIR` environment variable is used.
+
+    `pending` may be a collection of `(gsis_id, play_id)` pairs for
+    plays whose footage is still being fetched (e.g., by
+    `nflvid.fetch_slices`). They are included even though their
+    footage isn't on disk yet.
+    """
+    al, missing = resolve_plays(plays, footage_play_dir, pending)
+    for play in missing:
+        print('Missing play %d from game %s' % (play.play_id, play.gsis_id))
+    return al
+
+
+def resolve_plays(plays, footage_play_dir=None, pending=()):
+    """
+    Like `nflvid.vlc.plays_and_paths`, except a pair is returned of
+    the association list and a list of the `nfldb.Play` objects that
+    have no footage. Nothing is printed. Both lists keep the order of
+    `plays`.
+
+    Plays are grouped by game, so the footage of each game is looked
+    up once no matter how many of its plays are given.
     """
     footage_play_dir = footage_play_dir or os.getenv('NFLVID_FOOTAGE_PLAY_DIR')
     if not footage_play_dir:
         raise IOError('Invalid footage play directory %s' % footage_play_dir)
 
-    al = []
+    sliced = {}  # gsis_id -> set of play ids with footage
+    al, missing = [], []
     for play in plays:
-        path = _play_path(footage_play_dir, play)
-        if path is not None:
+        gsis_id = play.gsis_id
+        if gsis_id not in sliced:
+            names = nflvid.footage_plays(footage_play_dir, gsis_id)
+            sliced[gsis_id] = set(int(name[0:-4]) for name in names)
+        if play.play_id in sliced[gsis_id] \
+                or (gsis_id, play.play_id) in pending:
+            path = nflvid.footage_play(footage_play_dir, gsis_id,
+                                       play.play_id, stat=False)
             al.append((play, path))
         else:
-            print('Missing play %d from game %s' % (
-                play.play_id, play.gsis_id))
-
-    return al
+            missing.append(play)
+    nflvid._save_footage_index(footage_play_dir)
+    return al, missing
 
 
 def make_xspf(db, play_paths):
@@ -219,7 +244,8 @@ def make_xspf(db, play_paths):
     return temp.name
 
 
-def watch(db, plays, footage_play_dir=None, verbose=False, hide_marquee=False):
+def watch(db, plays, footage_play_dir=None, verbose=False, hide_marquee=False,
+          pending=()):
     """
     Opens an instance of `vlc` with a playlist corresponding to
     available footage for the `plays` given, where `plays` should be a
@@ -237,6 +263,9 @@ def watch(db, plays, footage_play_dir=None, verbose=False, hide_marquee=False):
 
     If `hide_marquee` is `True`, then no overlay text will be written
     on the plays.
+
+    `pending` is passed to `nflvid.vlc.resolve_plays`, so that plays
+    still being fetched can be added to the playlist.
     """
     footage_play_dir = footage_play_dir or os.getenv('NFLVID_FOOTAGE_PLAY_DIR')
     if not footage_play_dir:
@@ -246,8 +275,11 @@ def watch(db, plays, footage_play_dir=None, verbose=False, hide_marquee=False):
     if not verbose:
         out = open(os.devnull)
 
-    play_paths = nflvid.vlc.plays_and_paths(plays,
-                                            footage_play_dir=footage_play_dir)
+    play_paths, missing = resolve_plays(plays, footage_play_dir, pending)
+    if missing:
+        games = set(play.gsis_id for play in missing)
+        print('Missing footage for %d plays from %d games.'
+              % (len(missing), len(games)))
     if len(play_paths) == 0:
         raise LookupError(
             'No video of plays found matching the criteria given.')
@@ -42,7 +42,8 @@ setup(
     ],
     platforms='ANY',
     packages=['nflvid'],
-    package_data={'nflvid': ['schedule-status', 'pbp-xml/*.xml.gz']},
+    package_data={'nflvid': ['schedule-status', 'pbp-index',
+                             'pbp-xml/*.xml.gz']},
     data_files=[('share/doc/nflvid', ['README.md', 'longdesc.rst',
                                       'UNLICENSE']),
                 ('share/doc/nflvid/doc', ['doc/nflvid/index.html'])],
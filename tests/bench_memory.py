@@ -0,0 +1,65 @@
+"""
+Measures how much memory the play timings of every game that comes with
+`nflvid` take when they are all loaded at once, and how long loading
+them takes. By default they are read from the timing index; with
+`--xml`, the XML data is parsed instead (which takes a few minutes).
+
+Run it with `make bench`. It isn't a test, so `make test` skips it.
+"""
+
+from __future__ import division
+
+import argparse
+import gc
+import os
+import os.path as path
+import resource
+import sys
+import time
+
+import nflvid
+
+
+def max_rss():
+    """
+    Returns the peak resident memory of this process in MB.
+    """
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':  # Bytes instead of KB.
+        kb /= 1024
+    return kb / 1024
+
+
+parser = argparse.ArgumentParser(
+    description='Measure the memory used by the play timings of every '
+                'game in nflvid/pbp-xml.')
+parser.add_argument('--xml', action='store_true',
+                    help='Parse the XML data instead of using the timing '
+                         'index.')
+args = parser.parse_args()
+
+xml_dir = path.dirname(nflvid._xmlf)
+eids = sorted(f[0:10] for f in os.listdir(xml_dir) if f.endswith('.xml.gz'))
+
+gc.collect()
+base, start = max_rss(), time.time()
+loaded, games, plays = [], 0, 0
+for eid in eids:
+    if args.xml:
+        rawxml = nflvid._get_xml_data(fpath=nflvid._xmlf % eid)
+        ts = nflvid._xml_timings(rawxml) or {}
+    else:
+        ts = dict((coach, nflvid._indexed_plays(eid, coach))
+                  for coach in (True, False))
+    ts = [ps for ps in ts.values() if ps]
+    if ts:
+        games += 1
+        plays += sum(len(ps) for ps in ts)
+        loaded.append(ts)
+elapsed = time.time() - start
+gc.collect()
+
+print('%d games, %d plays from %s: %.1f MB in %.2fs (%.0f bytes per play)'
+      % (games, plays, 'XML' if args.xml else 'the timing index',
+         max_rss() - base, elapsed,
+         (max_rss() - base) * 1024 * 1024 / max(plays, 1)))
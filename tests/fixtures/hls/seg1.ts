@@ -0,0 +1 @@
+segment 1
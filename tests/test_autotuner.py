@@ -0,0 +1,91 @@
+"""
+Tests how `nflvid._Autotuner` changes the number of `ffmpeg` processes
+that `nflvid.slice_many` runs, by feeding it made-up timings. The clock
+and the CPU time of child processes are faked, so the tests are quick
+and don't depend on the machine.
+
+Run them with `make test`.
+"""
+
+import os
+import time
+import unittest
+
+import nflvid
+
+
+class TestAutotuner (unittest.TestCase):
+    def setUp(self):
+        self.now, self.cpu = 1000.0, 0.0
+        self._time, self._times = time.time, os.times
+        time.time = lambda: self.now
+        os.times = lambda: (0.0, 0.0, self.cpu, 0.0, self.now)
+
+        self.tuner = nflvid._Autotuner(window=10)
+        self.tuner.cpus, self.tuner.high = 4, 16
+        self.tuner.limit = 4
+        self.tuner._reset()
+
+    def tearDown(self):
+        time.time, os.times = self._time, self._times
+
+    def window(self, plays_per_min, cpu=0.5):
+        """
+        Runs one measurement window in which `plays_per_min` plays per
+        minute were sliced while `ffmpeg` used `cpu` of every CPU, and
+        returns the limit after it.
+        """
+        t = self.tuner
+        self.now += t.window
+        self.cpu += cpu * t.window * t.cpus
+        jobs = t.limit
+        plays = plays_per_min * t.window / 60.0 / jobs
+        for _ in xrange(jobs):
+            t.record(plays, 1.0, 0)
+        return t.limit
+
+    def test_starts_at_cpus(self):
+        t = nflvid._Autotuner()
+        self.assertEqual(t.limit, t.cpus)
+        self.assertEqual((t.low, t.high), (1, t.cpus * 4))
+
+    def test_waits_for_window(self):
+        self.now += 5
+        for _ in xrange(10):
+            self.tuner.record(1, 1.0, 0)
+        self.assertEqual(self.tuner.limit, 4)
+
+    def test_climbs_while_faster(self):
+        self.assertEqual([self.window(r) for r in (100, 110, 120)],
+                         [5, 6, 7])
+
+    def test_turns_around_when_slower(self):
+        self.assertEqual([self.window(r) for r in (100, 110, 90, 95)],
+                         [5, 6, 5, 4])
+
+    def test_holds_while_cpu_busy(self):
+        self.assertEqual(self.window(100), 5)
+        self.assertEqual(self.window(110, cpu=0.95), 5)
+        self.assertEqual(self.window(120, cpu=0.95), 5)
+
+        # Once the CPUs free up, it keeps climbing.
+        self.assertEqual(self.window(130), 6)
+
+    def test_lowers_while_cpu_busy(self):
+        self.assertEqual([self.window(r, cpu=0.95) for r in (100, 90)],
+                         [4, 3])
+
+    def test_bounds(self):
+        rate = 100
+        for _ in xrange(20):
+            rate += 10
+            self.window(rate)
+        self.assertEqual(self.tuner.limit, self.tuner.high)
+
+        self.tuner.limit, self.tuner._step = 2, -1
+        self.tuner._last_rate = None
+        self.assertEqual([self.window(r) for r in (100, 110)], [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
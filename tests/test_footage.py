@@ -0,0 +1,109 @@
+"""
+Tests that the footage index keeps looking up sliced plays cheap: once
+it is saved, each game costs one `stat` of its directory no matter how
+many plays it has.
+
+Run them with `make test`.
+"""
+
+import os
+import os.path as path
+import shutil
+import tempfile
+import time
+import unittest
+
+import nflvid
+
+try:
+    import nflvid.vlc
+except ImportError:  # nfldb isn't installed.
+    vlc = None
+else:
+    vlc = nflvid.vlc
+
+
+class Play (object):
+    """
+    Just enough of an `nfldb.Play` for `nflvid.vlc.resolve_plays`.
+    """
+    def __init__(self, gsis_id, play_id):
+        self.gsis_id, self.play_id = gsis_id, play_id
+
+
+class Counter (object):
+    """
+    Counts the calls of `os.stat` and `os.listdir` while it is used in
+    a `with` statement.
+    """
+    def __enter__(self):
+        self.stat, self.listdir = 0, 0
+        self._stat, self._listdir = os.stat, os.listdir
+
+        def stat(p):
+            self.stat += 1
+            return self._stat(p)
+
+        def listdir(p):
+            self.listdir += 1
+            return self._listdir(p)
+        os.stat, os.listdir = stat, listdir
+        return self
+
+    def __exit__(self, *exc):
+        os.stat, os.listdir = self._stat, self._listdir
+
+
+class TestFootageIndex (unittest.TestCase):
+    games = ['20120905%02d' % g for g in range(5)]
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for eid in self.games:
+            os.makedirs(path.join(self.root, eid))
+            for pid in range(1, 100, 2):
+                open(path.join(self.root, eid, '%04d.mp4' % pid), 'w')
+
+        # Directories modified in the same second that the index is saved
+        # are scanned again, so wait that out before saving it.
+        time.sleep(1.1)
+        nflvid._footage_indexes.clear()
+        nflvid.footage_index(self.root)
+        nflvid._footage_indexes.clear()
+
+    def tearDown(self):
+        nflvid._footage_indexes.clear()
+        shutil.rmtree(self.root)
+
+    def test_saved(self):
+        self.assertTrue(path.isfile(path.join(self.root, '.nflvid-index')))
+
+    def test_one_stat_per_game(self):
+        with Counter() as c:
+            for eid in self.games:
+                self.assertEqual(len(nflvid.footage_plays(self.root, eid)),
+                                 50)
+        self.assertEqual(c.listdir, 0)
+        self.assertEqual(c.stat, 1 + len(self.games))
+
+    def test_changed_game(self):
+        eid = self.games[0]
+        open(path.join(self.root, eid, '0002.mp4'), 'w')
+        with Counter() as c:
+            fp = nflvid.footage_play(self.root, eid, 2)
+        self.assertEqual(fp, path.join(self.root, eid, '0002.mp4'))
+        self.assertEqual(c.listdir, 1)
+
+    @unittest.skipIf(vlc is None, 'nfldb is not installed')
+    def test_resolve_plays(self):
+        plays = [Play(eid, pid) for eid in self.games for pid in range(100)]
+        with Counter() as c:
+            found, missing = vlc.resolve_plays(plays, self.root)
+        self.assertEqual(len(found), 50 * len(self.games))
+        self.assertEqual(len(missing), 50 * len(self.games))
+        self.assertEqual(c.listdir, 0)
+        self.assertEqual(c.stat, 1 + len(self.games))
+
+
+if __name__ == '__main__':
+    unittest.main()
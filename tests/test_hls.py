@@ -0,0 +1,139 @@
+"""
+Tests reading HLS playlists and resuming downloads with `nflvid.hls`
+against the small playlist in `fixtures/hls`, which is served over HTTP
+by `SimpleHTTPServer` for the duration of the tests.
+
+The segments aren't real video, so remuxing them is replaced with
+concatenating them. That way, `ffmpeg` isn't needed either.
+
+Run them with `make test`.
+"""
+
+import BaseHTTPServer
+import os
+import os.path as path
+import shutil
+import SimpleHTTPServer
+import tempfile
+import threading
+import unittest
+
+import nflvid.hls as hls
+
+fixtures = path.join(path.dirname(path.abspath(__file__)), 'fixtures', 'hls')
+
+
+class Handler (SimpleHTTPServer.SimpleHTTPRequestHandler):
+    """
+    Serves the files in `fixtures`, records every path requested and
+    fails requests for the paths in `failing`.
+    """
+    requested = []
+    failing = set()
+
+    def translate_path(self, p):
+        return path.join(fixtures, p.lstrip('/'))
+
+    def do_GET(self):
+        Handler.requested.append(self.path)
+        if self.path in Handler.failing:
+            self.send_error(503)
+            return
+        SimpleHTTPServer.SimpleHTTPRequestHandler.do_GET(self)
+
+    def log_message(self, *args):
+        pass
+
+
+def concat(files, outpath, start=None, duration=None):
+    with open(outpath, 'wb') as out:
+        for fp in files:
+            with open(fp, 'rb') as f:
+                out.write(f.read())
+    return True
+
+
+def segment_data(*ns):
+    return ''.join(open(path.join(fixtures, 'seg%d.ts' % n)).read()
+                   for n in ns)
+
+
+class TestHLS (unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), Handler)
+        cls.url = 'http://127.0.0.1:%d/' % cls.server.server_port
+        t = threading.Thread(target=cls.server.serve_forever)
+        t.daemon = True
+        t.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.outpath = path.join(self.dir, '2012090500.mp4')
+        Handler.requested[:] = []
+        Handler.failing.clear()
+        self._remux, self._retries = hls._remux, hls.retries
+        hls._remux, hls.retries = concat, 1
+
+    def tearDown(self):
+        hls._remux, hls.retries = self._remux, self._retries
+        shutil.rmtree(self.dir)
+
+    def test_segments(self):
+        segs = hls.segments(self.url + 'master.m3u8')
+        self.assertEqual(segs, [(self.url + 'seg0.ts', 4.0),
+                                (self.url + 'seg1.ts', 4.0),
+                                (self.url + 'seg2.ts', 3.5),
+                                (self.url + 'seg3.ts', 2.0)])
+        self.assertNotIn('/low/media.m3u8', Handler.requested)
+
+    def test_segments_missing(self):
+        self.assertIsNone(hls.segments(self.url + 'nope.m3u8'))
+
+    def test_download(self):
+        self.assertTrue(hls.download(self.url + 'master.m3u8', self.outpath))
+        self.assertEqual(open(self.outpath).read(), segment_data(0, 1, 2, 3))
+        self.assertFalse(path.exists(path.join(self.dir, '2012090500.hls')))
+
+    def test_resume(self):
+        url = self.url + 'master.m3u8'
+        Handler.failing.add('/seg2.ts')
+        self.assertFalse(hls.download(url, self.outpath, jobs=2))
+        self.assertFalse(path.exists(self.outpath))
+        workdir = path.join(self.dir, '2012090500.hls')
+        self.assertTrue(path.isfile(path.join(workdir, 'manifest.json')))
+
+        # Only the segment that failed is downloaded again.
+        Handler.failing.clear()
+        Handler.requested[:] = []
+        self.assertTrue(hls.download(url, self.outpath, jobs=2))
+        self.assertEqual(sorted(p for p in Handler.requested
+                                if p.endswith('.ts')), ['/seg2.ts'])
+        self.assertEqual(open(self.outpath).read(), segment_data(0, 1, 2, 3))
+        self.assertFalse(path.exists(workdir))
+
+    def test_resume_missing_segment(self):
+        url = self.url + 'master.m3u8'
+        Handler.failing.add('/seg3.ts')
+        self.assertFalse(hls.download(url, self.outpath))
+
+        # A segment recorded in the manifest but gone from disk is
+        # downloaded again too.
+        workdir = path.join(self.dir, '2012090500.hls')
+        os.remove(hls._segment_path(workdir, 0))
+        Handler.failing.clear()
+        Handler.requested[:] = []
+        self.assertTrue(hls.download(url, self.outpath))
+        self.assertEqual(sorted(p for p in Handler.requested
+                                if p.endswith('.ts')),
+                         ['/seg0.ts', '/seg3.ts'])
+        self.assertEqual(open(self.outpath).read(), segment_data(0, 1, 2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests that `nflvid.sync_xml` only saves the XML of games that are over,
+against XML served over HTTP by `SimpleHTTPServer` from a temporary
+directory.
+
+Run them with `make test`.
+"""
+
+import BaseHTTPServer
+import os
+import os.path as path
+import shutil
+import SimpleHTTPServer
+import tempfile
+import threading
+import unittest
+
+import nflvid
+
+xml = '<?xml version="1.0" encoding="UTF-8"?>\n<dataset></dataset>\n'
+
+
+class TestSyncXML (unittest.TestCase):
+    def setUp(self):
+        self.served = tempfile.mkdtemp()
+        self.xml_dir = tempfile.mkdtemp()
+        os.makedirs(path.join(self.served, '2012'))
+        for gamekey in ('55837', '55838'):
+            with open(path.join(self.served, '2012', '%s.xml' % gamekey),
+                      'w') as f:
+                f.write(xml)
+
+        served = self.served
+
+        class Handler (SimpleHTTPServer.SimpleHTTPRequestHandler):
+            def translate_path(self, p):
+                return path.join(served, p.lstrip('/'))
+
+            def log_message(self, *args):
+                pass
+
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = 'http://127.0.0.1:%d/%%d/%%s.xml' \
+            % self.server.server_port
+        t = threading.Thread(target=self.server.serve_forever)
+        t.daemon = True
+        t.start()
+        self._cache_dir, nflvid.cache_dir = nflvid.cache_dir, None
+
+    def tearDown(self):
+        nflvid.cache_dir = self._cache_dir
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.served)
+        shutil.rmtree(self.xml_dir)
+
+    def sync(self, **kwargs):
+        games = [('2012090500', '55837'), ('2012090900', '55838')]
+        return list(nflvid.sync_xml(games, self.xml_dir, jobs=2,
+                                    base_url=self.base_url, **kwargs))
+
+    def test_unfinished_not_saved(self):
+        results = self.sync(game_over=lambda eid: eid == '2012090500')
+        self.assertEqual([r[0:2] for r in results],
+                         [('2012090500', 'saved'),
+                          ('2012090900', 'unfinished')])
+        self.assertEqual(sorted(os.listdir(self.xml_dir)),
+                         ['2012090500.xml.gz'])
+        self.assertEqual(nflvid._get_xml_data(
+            fpath=path.join(self.xml_dir, '2012090500.xml.gz')), xml)
+
+    def test_unfinished_not_refreshed(self):
+        self.sync(game_over=lambda eid: True)
+        results = self.sync(refresh=True, game_over=lambda eid: False)
+        self.assertEqual([r[1] for r in results],
+                         ['unfinished', 'unfinished'])
+
+    def test_future_game(self):
+        self.assertFalse(nflvid._game_over('2999090500'))
+
+
+if __name__ == '__main__':
+    unittest.main()
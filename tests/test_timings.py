@@ -0,0 +1,66 @@
+"""
+Tests that the XML parsers used to read play timings agree with each
+other on every game that comes with `nflvid`.
+
+Run them with `make test`. Parsing every game with BeautifulSoup takes
+a few minutes.
+"""
+
+import gzip
+import os
+import os.path as path
+import unittest
+
+import nflvid
+
+xml_dir = path.join(path.dirname(nflvid.__file__), 'pbp-xml')
+
+
+def read_xml(fname):
+    return gzip.open(path.join(xml_dir, fname)).read()
+
+
+def flatten(ts):
+    """
+    Returns the timings from `nflvid._xml_timings` as plain values so
+    that two results can be compared.
+    """
+    if ts is None:
+        return None
+    flat = {}
+    for coach, ps in ts.items():
+        if ps is None:
+            flat[coach] = None
+            continue
+        flat[coach] = [(pid, str(p.start), str(p.end), str(p.game_end))
+                       for pid, p in ps.items()]
+    return flat
+
+
+class TestParsers (unittest.TestCase):
+    def test_backends_agree(self):
+        fnames = sorted(os.listdir(xml_dir))
+        self.assertTrue(len(fnames) > 0)
+        for fname in fnames:
+            data = read_xml(fname)
+            etree = flatten(nflvid._xml_timings(data, 'etree'))
+            bs4 = flatten(nflvid._xml_timings(data, 'bs4'))
+            self.assertEqual(etree, bs4, 'Parsers disagree on %s' % fname)
+
+    def test_etree_falls_back_to_bs4(self):
+        # This game's XML isn't well formed, so etree can't read it.
+        data = read_xml('2012012200.xml.gz')
+        self.assertRaises(nflvid.etree.ParseError,
+                          nflvid._xml_rows_etree, data)
+        ts = nflvid._xml_timings(data, 'etree')
+        self.assertTrue(ts[True] or ts[False])
+        self.assertEqual(flatten(ts),
+                         flatten(nflvid._xml_timings(data, 'bs4')))
+
+    def test_unknown_parser(self):
+        self.assertRaises(ValueError, nflvid._xml_timings, '<dataset/>',
+                          'lxml')
+
+
+if __name__ == '__main__':
+    unittest.main()